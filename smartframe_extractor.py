@@ -1,4 +1,5 @@
 # --- Standard Library Imports ---
+import asyncio
 import os
 import shutil
 import json
@@ -11,11 +12,19 @@ import logging.handlers
 import multiprocessing
 import tempfile
 import threading
-import base64
+import contextlib
+import functools
+import collections
+import concurrent.futures
 import datetime
+import argparse
+import csv
+import io
+import queue
+import atexit
 from pathlib import Path
 from typing import List, Tuple, Dict, Optional, Any
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin, urlsplit, urlunsplit
 
 # --- Third-Party Imports ---
 missing_dependencies: List[str] = []
@@ -28,12 +37,15 @@ except ImportError:
     )
 
 try:
-    from PIL import Image
+    # Pillow-SIMD (built against libjpeg-turbo) is a drop-in replacement with faster JPEG encode.
+    import PIL
+    from PIL import Image, features as pil_features
 except ImportError:
     missing_dependencies.append("Pillow (pip install Pillow)")
 
 try:
     import requests
+    from urllib3.util.retry import Retry
 except ImportError:
     missing_dependencies.append("requests (pip install requests)")
 
@@ -56,15 +68,106 @@ if missing_dependencies:
     )
     sys.exit(1)
 
+# --- Optional Third-Party Imports ---
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import pyexiv2
+except ImportError:
+    pyexiv2 = None
+
 # --- Configuration Constants ---
 TEMP_DIR_PREFIX = "smartframe_extractor_"
 LOG_FILE = "smartframe_extractor.log"
+LOG_BUFFER_CAPACITY = 1000
 MAX_RETRIES = 5
 RETRY_DELAY_SECONDS = 5
 THUMBNAIL_DOWNLOAD_TIMEOUT = 10
+THUMBNAIL_CHUNK_SIZE = 1024 * 1024
+THUMBNAIL_MAX_RETRIES = 3
+THUMBNAIL_RETRY_BACKOFF_SECONDS = 0.3
+# Sent with thumbnail downloads so they look like the Chromium session that loaded the page.
+HTTP_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+THUMBNAIL_SINGLE_READ_MAX_BYTES = 50 * 1024 * 1024
 MIN_CAPTION_LENGTH = 3
 METADATA_SEPARATOR_LENGTH = 50
 FAILED_DOWNLOADS_FILE = "failed_downloads.txt"
+RESULTS_FILE_BASENAME = "download_results"
+RESULTS_FILE_EXTENSIONS = {"ndjson": ".jsonl", "json": ".json", "csv": ".csv"}
+RESULT_FIELDS = ("Original URL", "Image ID", "Status", "Output Filename", "Error Message")
+URLS_FILE = "urls.txt"
+# Metadata fields extracted from SmartFrame pages, in the order they are reported.
+METADATA_FIELDS = (
+    "caption", "date", "credit", "image_id", "image_size", "provider", "location",
+    "city", "country", "photographer", "featuring", "title", "subject"
+)
+# Label prefixes for the metadata text file, rendered once at import.
+METADATA_FILE_LABELS = {key: f"{key.replace('_', ' ').title()}: " for key in METADATA_FIELDS}
+
+# ExifTool tags written for each plain metadata field. Dates and featured people need
+# extra processing and are handled separately in write_metadata_to_image.
+METADATA_TAG_MAP: Dict[str, Tuple[str, ...]] = {
+    # Caption/Description fields
+    "caption": ("IPTC:Caption-Abstract", "XMP:Description", "EXIF:ImageDescription"),
+    # Headline/Title fields (IPTC ObjectName & Headline, plus XMP/EXIF equivalents)
+    "title": ("IPTC:ObjectName", "IPTC:Headline", "XMP:Title", "XMP-photoshop:Headline", "EXIF:XPTitle"),
+    # Store the subject as both XMP subject and IPTC keyword for wider compatibility
+    "subject": ("XMP:Subject", "IPTC:Keywords"),
+    # Credit/Source fields and Author field
+    "credit": ("IPTC:Credit", "IPTC:By-line", "XMP:Credit", "EXIF:Artist", "XMP:Creator"),
+    # Source/Provider fields
+    "provider": ("IPTC:Source", "XMP:Source"),
+    "city": ("IPTC:City", "XMP-photoshop:City"),
+    "country": ("IPTC:Country-PrimaryLocationName", "XMP-photoshop:Country"),
+    "location": ("IPTC:Sub-location", "XMP-photoshop:Location"),
+    "photographer": ("XMP:Contributor",),
+    # Image ID in custom fields
+    "image_id": ("XMP:Identifier", "IPTC:OriginalTransmissionReference"),
+}
+
+OUTPUT_DIR = "downloaded_images"
+MAX_CONCURRENT_URLS = 4
+URL_QUEUE_SIZE_PER_WORKER = 2
+PAGE_MAX_REUSES = 25
+# "jpg" has the browser encode the canvas as JPEG directly; "png" keeps a lossless capture
+# that Pillow converts (use it when the canvas may contain transparency).
+CANVAS_FORMATS = ("jpg", "png")
+DEFAULT_CANVAS_FORMAT = "jpg"
+JPEG_MAGIC = b"\xff\xd8\xff"
+# Extra Chromium switches. Playwright's default switches already disable background networking,
+# timer throttling, renderer backgrounding and the like, and repeating --disable-features here
+# would replace Playwright's own list, so only what the defaults leave out is added.
+# Playwright mutes audio only in headless mode; this script runs headed.
+CHROMIUM_PERFORMANCE_ARGS = (
+    "--mute-audio",
+)
+# Analytics and ad hosts made unresolvable through --host-resolver-rules. A Chromium switch
+# rather than context.route() keeps the HTTP cache on and costs no Python round-trip per request.
+BLOCKED_REQUEST_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "hotjar.com",
+    "scorecardresearch.com",
+)
+
+def blocked_hosts_switch(hosts) -> str:
+    """Builds a --host-resolver-rules switch that makes each host and its subdomains unresolvable."""
+    rules = ", ".join(f"MAP {pattern} ~NOTFOUND" for host in hosts for pattern in (host, f"*.{host}"))
+    return f"--host-resolver-rules={rules}"
 
 # --- Logging Setup ---
 logger = logging.getLogger(__name__)
@@ -74,14 +177,28 @@ ch = logging.StreamHandler(sys.stdout)
 ch.setLevel(logging.INFO)
 formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
 ch.setFormatter(formatter)
-logger.addHandler(ch)
 
 fh = logging.handlers.RotatingFileHandler(
-    LOG_FILE, maxBytes=10*1024*1024, backupCount=5
+    LOG_FILE, maxBytes=10*1024*1024, backupCount=5, delay=True
 )
 fh.setLevel(logging.INFO)
 fh.setFormatter(formatter)
-logger.addHandler(fh)
+
+# Batch file writes: records are buffered and written together, immediately on ERROR or above.
+mh = logging.handlers.MemoryHandler(
+    capacity=LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=fh, flushOnClose=True
+)
+mh.setLevel(logging.INFO)
+atexit.register(mh.close)
+
+# Callers only enqueue records; console and file I/O happen on the listener thread.
+log_queue: queue.Queue = queue.Queue(-1)
+queue_handler = logging.handlers.QueueHandler(log_queue)
+logger.addHandler(queue_handler)
+log_listener = logging.handlers.QueueListener(log_queue, ch, mh, respect_handler_level=True)
+log_listener.start()
+# Registered after mh.close, so at exit the queue drains into the buffer before it is flushed.
+atexit.register(log_listener.stop)
 
 # --- Chrome Extension Files Content (MANIFEST V3) ---
 MANIFEST_JSON_CONTENT = """
@@ -122,14 +239,14 @@ console.log("Canvas Extractor V3: Service Worker loaded.");
 chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
   console.log("Canvas Extractor V3: Message received in service worker.", request);
   
-  if (request.action === "getCanvasDataURL") {
+  if (request.action === "getCanvasBlobURL") {
     console.log(`Canvas Extractor V3: Executing script in tab ${sender.tab.id} to get canvas data.`);
     
     // Manifest V3: Use chrome.scripting.executeScript instead of chrome.tabs.executeScript
     chrome.scripting.executeScript({
       target: { tabId: sender.tab.id },
       world: 'MAIN', // CRITICAL: Run in MAIN world to access window.__smartFrameShadowRoot
-      func: (selector) => {
+      func: (selector, targetFormat) => {
         console.log('Canvas Extractor [Privileged]: Script started in page context.');
           const selectorsToTry = [];
           if (selector) {
@@ -161,112 +278,124 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
           }
         console.log('Canvas Extractor [Privileged]: smartframe-embed found.');
         
-        // Function to search for canvas with retry logic
-        // Increased from 10 to 15 attempts and delay from 500ms to 1000ms for large canvas dimensions (9999x9999)
-        function findCanvas(maxAttempts = 15, delay = 1000) {
+        // Locate the canvas, preferring the captured shadow root, then direct shadowRoot access,
+        // then the document itself.
+        function locateCanvas() {
+          const shadowRoots = [window.__smartFrameShadowRoot, smartframeEmbed.shadowRoot];
+          for (const root of shadowRoots) {
+            if (!root) {
+              continue;
+            }
+            const canvas = root.querySelector('canvas.stage') || root.querySelector('canvas');
+            if (canvas) {
+              return canvas;
+            }
+          }
+          return document.querySelector('canvas.stage') ||
+            document.querySelector('canvas[width][height]') ||
+            document.querySelector('canvas');
+        }
+
+        // Resolve the instant a canvas appears instead of polling once per second.
+        // MutationObservers watch the shadow root(s) and the document; a slow periodic check only
+        // attaches observers to shadow roots created after the search started.
+        function findCanvas(timeoutMs = 15000, rootCheckInterval = 1000) {
           return new Promise((resolve) => {
-            let attempts = 0;
-            
-            function tryFind() {
-              attempts++;
-              console.log(`Canvas Extractor [Privileged]: Search attempt ${attempts}/${maxAttempts}`);
-              
-              let canvas = null;
-              
-              // First, try to use the captured shadow root from window object
-              if (window.__smartFrameShadowRoot) {
-                console.log('Canvas Extractor [Privileged]: Checking captured shadow root...');
-                const allCanvases = window.__smartFrameShadowRoot.querySelectorAll('canvas');
-                console.log(`Canvas Extractor [Privileged]: Found ${allCanvases.length} canvas element(s) in captured shadowRoot`);
-                
-                canvas = window.__smartFrameShadowRoot.querySelector('canvas.stage');
-                if (!canvas) {
-                  canvas = window.__smartFrameShadowRoot.querySelector('canvas');
-                }
-                if (canvas) {
-                  console.log('Canvas Extractor [Privileged]: Canvas found in captured shadowRoot');
-                }
-              } else {
-                console.log('Canvas Extractor [Privileged]: window.__smartFrameShadowRoot is null/undefined');
+            const existing = locateCanvas();
+            if (existing) {
+              console.log(`Canvas Extractor [Privileged]: Canvas found immediately. Width: ${existing.width}, Height: ${existing.height}`);
+              resolve(existing);
+              return;
+            }
+
+            const observedRoots = new Set();
+            const observers = [];
+            let settled = false;
+            let rootCheckTimer = null;
+            let timeoutTimer = null;
+
+            function finish(canvas) {
+              if (settled) {
+                return;
               }
-              
-              // If not found via captured reference, try direct shadowRoot access
-              if (!canvas) {
-                const shadowRoot = smartframeEmbed.shadowRoot;
-                if (shadowRoot) {
-                  console.log('Canvas Extractor [Privileged]: Checking direct shadowRoot access...');
-                  const allCanvases = shadowRoot.querySelectorAll('canvas');
-                  console.log(`Canvas Extractor [Privileged]: Found ${allCanvases.length} canvas element(s) in direct shadowRoot`);
-                  
-                  canvas = shadowRoot.querySelector('canvas.stage');
-                  if (!canvas) {
-                    canvas = shadowRoot.querySelector('canvas');
-                  }
-                  if (canvas) {
-                    console.log('Canvas Extractor [Privileged]: Canvas found in shadowRoot via direct access');
-                  }
-                } else {
-                  console.log('Canvas Extractor [Privileged]: smartframeEmbed.shadowRoot is null');
-                }
+              settled = true;
+              observers.forEach(observer => observer.disconnect());
+              clearInterval(rootCheckTimer);
+              clearTimeout(timeoutTimer);
+              resolve(canvas);
+            }
+
+            function checkForCanvas() {
+              const canvas = locateCanvas();
+              if (canvas) {
+                console.log(`Canvas Extractor [Privileged]: Canvas found via DOM observation. Width: ${canvas.width}, Height: ${canvas.height}`);
+                finish(canvas);
               }
-              
-              // Fallback to searching the entire document if not found in shadow DOM
-              if (!canvas) {
-                console.log('Canvas Extractor [Privileged]: Searching in document...');
-                const allCanvases = document.querySelectorAll('canvas');
-                console.log(`Canvas Extractor [Privileged]: Found ${allCanvases.length} canvas element(s) in document`);
-                
-                canvas = document.querySelector('canvas.stage');
-                if (!canvas) {
-                  canvas = document.querySelector('canvas[width][height]');
-                  if (!canvas) {
-                    canvas = document.querySelector('canvas');
-                  }
-                }
-                if (canvas) {
-                  console.log('Canvas Extractor [Privileged]: Canvas found in document');
+            }
+
+            function observeAvailableRoots() {
+              const roots = [window.__smartFrameShadowRoot, smartframeEmbed.shadowRoot, document.documentElement];
+              for (const root of roots) {
+                if (!root || observedRoots.has(root)) {
+                  continue;
                 }
-              }
-              
-              if (canvas) {
-                console.log(`Canvas Extractor [Privileged]: Canvas found on attempt ${attempts}. Width: ${canvas.width}, Height: ${canvas.height}`);
-                resolve(canvas);
-              } else if (attempts < maxAttempts) {
-                console.log(`Canvas Extractor [Privileged]: Canvas not found, retrying in ${delay}ms...`);
-                setTimeout(tryFind, delay);
-              } else {
-                console.error('Canvas Extractor [Privileged]: Canvas element not found after all attempts.');
-                resolve(null);
+                observedRoots.add(root);
+                const observer = new MutationObserver(checkForCanvas);
+                observer.observe(root, { childList: true, subtree: true });
+                observers.push(observer);
               }
             }
-            
-            tryFind();
+
+            console.log('Canvas Extractor [Privileged]: Canvas not present yet, observing DOM for it...');
+            observeAvailableRoots();
+            rootCheckTimer = setInterval(() => {
+              observeAvailableRoots();
+              checkForCanvas();
+            }, rootCheckInterval);
+            timeoutTimer = setTimeout(() => {
+              console.error(`Canvas Extractor [Privileged]: Canvas element not found within ${timeoutMs}ms.`);
+              finish(null);
+            }, timeoutMs);
           });
         }
         
         // Return a promise that resolves with the result
         return findCanvas().then(canvas => {
           if (!canvas) {
-            return { error: 'Canvas element not found after all retry attempts' };
+            return { error: 'Canvas element not found before the search timed out' };
           }
 
-          console.log('Canvas Extractor [Privileged]: Canvas found. Attempting to get data URL.');
-          try {
-            // CRITICAL FIX: Use original toDataURL and apply to current canvas
-            const tempCanvas = document.createElement("canvas");
-            tempCanvas.width = canvas.width || 1920; 
-            tempCanvas.height = canvas.height || 1080;
-
-            const dataUrl = tempCanvas.toDataURL.call(canvas, 'image/png');
-            console.log('Canvas Extractor [Privileged]: Successfully generated data URL length:', dataUrl ? dataUrl.length : 'null');
-            return { dataUrl: dataUrl };
-          } catch (e) {
-            console.error('Canvas Extractor [Privileged]: Error calling toDataURL:', e);
-            return { error: 'Error calling toDataURL: ' + e.message };
-          }
+          // Encoding straight to JPEG skips a slow, large PNG that Python would only re-encode.
+          const mimeType = targetFormat === 'jpg' ? 'image/jpeg' : 'image/png';
+          // 0.95 matches the quality=95 Pillow uses when converting PNG captures.
+          const quality = targetFormat === 'jpg' ? 0.95 : undefined;
+          console.log(`Canvas Extractor [Privileged]: Canvas found. Attempting to encode canvas to a ${mimeType} blob.`);
+          return new Promise((resolve) => {
+            try {
+              // CRITICAL FIX: Use the native toBlob captured at document start (before page scripts
+              // could patch it) and apply it to the current canvas, without allocating a temp canvas.
+              const nativeToBlob = window.__smartFrameNativeToBlob || HTMLCanvasElement.prototype.toBlob;
+
+              // toBlob encodes asynchronously into binary data; only a short blob: URL is passed back,
+              // instead of a base64 data URL several times the size of the image.
+              nativeToBlob.call(canvas, (blob) => {
+                if (!blob) {
+                  console.error('Canvas Extractor [Privileged]: toBlob returned no data.');
+                  resolve({ error: 'Canvas toBlob returned no data' });
+                  return;
+                }
+                const blobUrl = URL.createObjectURL(blob);
+                console.log(`Canvas Extractor [Privileged]: Successfully encoded canvas blob (${blob.size} bytes): ${blobUrl}`);
+                resolve({ blobUrl: blobUrl });
+              }, mimeType, quality);
+            } catch (e) {
+              console.error('Canvas Extractor [Privileged]: Error calling toBlob:', e);
+              resolve({ error: 'Error calling toBlob: ' + e.message });
+            }
+          });
         });
       },
-      args: [request.selector]
+      args: [request.selector, request.targetFormat]
     }).then(results => {
       console.log("Canvas Extractor V3: Script execution finished.");
       const result = results && results[0] && results[0].result;
@@ -303,13 +432,15 @@ window.addEventListener('message', function(event) {
   if (event.data && event.data.type === 'GET_CANVAS_DATA') {
     console.log("Canvas Extractor V3 [Content]: 'GET_CANVAS_DATA' message received by content script.");
     const selector = event.data.selector;
+    const targetFormat = event.data.targetFormat;
 
     console.log(`Canvas Extractor V3 [Content]: Sending message to service worker for selector: ${selector}`);
     
     // Send a message to the service worker, requesting the data URL
     chrome.runtime.sendMessage({
-      action: "getCanvasDataURL",
-      selector: selector
+      action: "getCanvasBlobURL",
+      selector: selector,
+      targetFormat: targetFormat
     }).then(response => {
       console.log("Canvas Extractor V3 [Content]: Received response from service worker.", response);
       
@@ -318,11 +449,11 @@ window.addEventListener('message', function(event) {
       responseDiv.id = 'extension-response-data';
       responseDiv.style.display = 'none';
       
-      if (response && response.dataUrl) {
-        console.log("Canvas Extractor V3 [Content]: Data URL received, creating response div with data-url.");
-        responseDiv.setAttribute('data-url', response.dataUrl);
+      if (response && response.blobUrl) {
+        console.log("Canvas Extractor V3 [Content]: Blob URL received, creating response div with data-blob-url.");
+        responseDiv.setAttribute('data-blob-url', response.blobUrl);
       } else {
-        const errorMsg = (response && response.error) || "Unknown error: No data URL returned.";
+        const errorMsg = (response && response.error) || "Unknown error: No blob URL returned.";
         console.error(`Canvas Extractor V3 [Content]: Error received from service worker: ${errorMsg}`);
         responseDiv.setAttribute('data-error', errorMsg);
       }
@@ -360,6 +491,13 @@ INJECTED_JAVASCRIPT_FOR_EXTENSION = """
       if (window.__SMARTFRAME_TARGET_IMAGE_ID === undefined) {
           window.__SMARTFRAME_TARGET_IMAGE_ID = null;
       }
+      if (window.__SMARTFRAME_TARGET_FORMAT === undefined) {
+          window.__SMARTFRAME_TARGET_FORMAT = null;
+      }
+      // Keep the untouched toBlob for the extension in case page scripts patch the prototype later.
+      if (window.__smartFrameNativeToBlob === undefined) {
+          window.__smartFrameNativeToBlob = HTMLCanvasElement.prototype.toBlob;
+      }
       const nativeAttachShadow = Element.prototype.attachShadow;
       Element.prototype.attachShadow = function(init) {
           const shadowRoot = nativeAttachShadow.call(this, init);
@@ -389,10 +527,12 @@ INJECTED_JAVASCRIPT_FOR_EXTENSION = """
 
     console.log('Injected JavaScript (Main Page): Shadow root capture hook applied.');
 
-      const smartframeEmbedSelector = window.__SMARTFRAME_EMBED_SELECTOR || 'smartframe-embed';
-      const smartframeTargetImageId = window.__SMARTFRAME_TARGET_IMAGE_ID || null;
-      
-      function resolveSmartFrameElement() {
+      // This script is registered once per page, before each job's selector script, so the
+      // per-job targets are read at resolve time rather than captured while still unset.
+      // With targetOnly set, only the job's own selectors are tried, never the generic fallbacks.
+      function resolveSmartFrameElement(targetOnly = false) {
+          const smartframeEmbedSelector = window.__SMARTFRAME_EMBED_SELECTOR || 'smartframe-embed';
+          const smartframeTargetImageId = window.__SMARTFRAME_TARGET_IMAGE_ID || null;
           const selectorsToTry = [];
           
           if (smartframeTargetImageId) {
@@ -403,8 +543,10 @@ INJECTED_JAVASCRIPT_FOR_EXTENSION = """
               selectorsToTry.push(smartframeEmbedSelector);
           }
           
-          selectorsToTry.push('smartframe-embed:not([thumbnail-mode])');
-          selectorsToTry.push('smartframe-embed');
+          if (!targetOnly) {
+              selectorsToTry.push('smartframe-embed:not([thumbnail-mode])');
+              selectorsToTry.push('smartframe-embed');
+          }
           
           for (const selector of selectorsToTry) {
               if (!selector) {
@@ -429,13 +571,13 @@ INJECTED_JAVASCRIPT_FOR_EXTENSION = """
     let extractionInitialized = false;
 
     // Use event-based initialization instead of polling
-    function initSmartFrameExtraction() {
+    function initSmartFrameExtraction(found) {
         // Prevent multiple executions
         if (extractionInitialized) {
             return;
         }
         
-      const { element: smartFrame, selector: resolvedSelector } = resolveSmartFrameElement();
+      const { element: smartFrame, selector: resolvedSelector } = found || resolveSmartFrameElement();
       if (smartFrame) {
             extractionInitialized = true;
             console.log('Injected JavaScript (Main Page): smartframe-embed found.');
@@ -485,7 +627,8 @@ INJECTED_JAVASCRIPT_FOR_EXTENSION = """
                 console.log('Injected JavaScript (Main Page): Attempting to send message to content script via window.postMessage.');
                 window.postMessage({
                     type: 'GET_CANVAS_DATA',
-                      selector: resolvedSelector || smartframeEmbedSelector
+                      selector: resolvedSelector || window.__SMARTFRAME_EMBED_SELECTOR || 'smartframe-embed',
+                    targetFormat: window.__SMARTFRAME_TARGET_FORMAT || 'png'
                 }, window.location.origin);
                 console.log('Injected JavaScript (Main Page): Message sent to content script.');
             }, 3000);
@@ -494,46 +637,301 @@ INJECTED_JAVASCRIPT_FOR_EXTENSION = """
         }
     }
 
-    // Wait for the page to fully load (matching TamperMonkey script behavior)
-    window.addEventListener('load', initSmartFrameExtraction);
-    
-    // Also try on DOMContentLoaded as a fallback for faster loading
+    // Resolve once the smartframe-embed exists: check when the DOM is parsed, then let a
+    // MutationObserver report the element the moment it is inserted, with one backstop timeout.
+    // Pages often insert thumbnail embeds before the main one, so until fallbackDelayMs has
+    // passed only the job's target embed is accepted; after that any embed will do.
+    function waitForSmartFrameElement(timeoutMs, fallbackDelayMs) {
+        return new Promise((resolve) => {
+            let targetOnly = true;
+            let observer = null;
+            let fallbackTimer = null;
+            let backstop = null;
+            const settle = (found) => {
+                if (observer) {
+                    observer.disconnect();
+                }
+                clearTimeout(fallbackTimer);
+                clearTimeout(backstop);
+                resolve(found);
+            };
+            const check = () => {
+                const candidate = resolveSmartFrameElement(targetOnly);
+                if (candidate.element) {
+                    settle(candidate);
+                    return true;
+                }
+                return false;
+            };
+            if (check()) {
+                return;
+            }
+            observer = new MutationObserver(check);
+            observer.observe(document, { childList: true, subtree: true });
+            fallbackTimer = setTimeout(() => {
+                targetOnly = false;
+                check();
+            }, fallbackDelayMs);
+            backstop = setTimeout(() => settle(resolveSmartFrameElement()), timeoutMs);
+        });
+    }
+
+    function startWhenReady() {
+        waitForSmartFrameElement(30000, 2000).then(initSmartFrameExtraction);
+    }
+
     if (document.readyState === 'loading') {
-        document.addEventListener('DOMContentLoaded', initSmartFrameExtraction);
+        document.addEventListener('DOMContentLoaded', startWhenReady, { once: true });
     } else {
-        // DOM already loaded, try now
-        initSmartFrameExtraction();
+        startWhenReady();
     }
-    
-    // Add a delayed retry in case the element loads after initial events
-    setTimeout(initSmartFrameExtraction, 1000);
-    setTimeout(initSmartFrameExtraction, 2000);
 })();
 """
 
+# Reads the SmartFrame details layout (provider, caption, details paragraph, info list) in one
+# evaluate. Without that layout the text fallback is certain to run, so the body text comes back
+# in the same call instead of a second round-trip. Text is trimmed and list items are collapsed
+# to single-spaced "Label: value" strings in the page, so only usable values cross over.
+SMARTFRAME_METADATA_JAVASCRIPT = """() => {
+    const container = document.querySelector('div.flex.flex-col.gap-4x');
+    if (!container) {
+        return { structured: null, bodyText: document.body ? document.body.innerText : null };
+    }
+    const sections = container.querySelectorAll('section');
+    const find = (section, selector) => (section ? section.querySelector(selector) : null);
+    const trimmedText = (element) => (element ? element.textContent.trim() || null : null);
+    const details = find(sections[1], 'p');
+    return {
+        structured: {
+            provider: trimmedText(find(sections[0], 'h2')),
+            caption: trimmedText(find(sections[1], 'h1')),
+            details: details ? details.innerText : null,
+            items: Array.from(
+                container.querySelectorAll('section.bg-iy-neutral-100 li'),
+                item => item.textContent.replace(/\\s+/g, ' ').trim()
+            ).filter(text => text.includes(':'))
+        },
+        bodyText: null
+    };
+}"""
+
 # --- Helper Functions ---
+_FILENAME_UNSAFE_CHAR_RE = re.compile(r'[^a-zA-Z0-9.\-_]')
+_FILENAME_DASH_RUN_RE = re.compile(r'-+')
+
+# Page labels (lowercased, without the colon) mapped to their metadata keys. The details paragraph,
+# the info list and the body-text fallback all resolve labels through this one table.
+METADATA_LABEL_FIELDS = {
+    "featuring": "featuring",
+    "where": "location",
+    "when": "date",
+    "credit": "credit",
+    "photographer": "photographer",
+    "country": "country",
+    "city": "city",
+    "smartframe image id": "image_id",
+    "image size": "image_size",
+}
+
+# "Label:" markers recognised in the SmartFrame details paragraph.
+DETAIL_MARKER_LABELS = ("Featuring", "Where", "When", "Credit", "SmartFrame image ID", "Image size")
+_DETAIL_MARKER_ALTERNATION = "|".join(map(re.escape, DETAIL_MARKER_LABELS))
+# Markers are often run together on one line, so a line break goes before each inline marker.
+_DETAIL_MARKER_BREAK_RE = re.compile(rf" (?=(?:{_DETAIL_MARKER_ALTERNATION}):)")
+_DETAIL_MARKER_LINE_RE = re.compile(rf"^[^\S\n]*({_DETAIL_MARKER_ALTERNATION}):(.*)$", re.MULTILINE)
+
+# Fields the structured info list ("Label: value" items) can supply.
+INFO_LIST_FIELDS = ("image_id", "image_size", "credit", "photographer", "country", "city")
+
+# Markers searched for in the page body when structured extraction leaves fields empty.
+# Most must start a line; the image ID and size markers may also appear mid-line, so their
+# value stops at the next marker on the same line and both can be read from one line.
+_FALLBACK_MARKER_RE = re.compile(
+    r"^[^\S\n]*(When|Credit|Featuring|Where|Photographer|Country|City):(.*)$"
+    rf"|(SmartFrame image ID|Image size):(.*?)(?=[^\S\n]+(?:{_DETAIL_MARKER_ALTERNATION}):|$)",
+    re.MULTILINE
+)
+
+# Yields each non-blank line with surrounding whitespace trimmed, without a split/strip pass.
+_NONEMPTY_LINE_RE = re.compile(r'^\s*(\S.*?)\s*$', re.MULTILINE)
+
+# ISO 8601 dates and date-times that can skip the slower dateutil parser.
+_ISO_DATETIME_RE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?(?:Z|[+-]\d{2}:\d{2})?")
+# Day-first dotted dates ("15.11.07", "25.12.2023") as printed on SmartFrame pages.
+_DOTTED_DATE_RE = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{2}|\d{4})")
+
+# smartframe.com itself or any of its subdomains, matched against a lowercased netloc.
+_SMARTFRAME_HOST_RE = re.compile(r'(?:[^.]+\.)*smartframe\.com')
+
+# A line starting with one of these is a metadata marker, never a fallback caption.
+CAPTION_EXCLUDED_PREFIXES = ("When:", "Credit:")
+
+# Splits a "Featuring:" value such as "A, B and C" into individual names.
+_FEATURING_SPLIT_RE = re.compile(r',|\s+and\s+')
+
+def apply_metadata_label(metadata: Dict[str, Optional[str]], label: str, value: str, log_prefix: str = "Found") -> bool:
+    """
+    Stores value under the metadata key for a page label unless that key is already filled.
+    A "Where" value also fills empty city/country from its first and last comma-separated parts.
+    Returns True if the label is known.
+    """
+    field = METADATA_LABEL_FIELDS.get(label.lower())
+    if field is None:
+        return False
+    if metadata[field]:
+        return True
+    value = value.strip()
+    metadata[field] = value
+    logger.info(f"{log_prefix} {field.replace('_', ' ')}: {value}")
+    if field == "location":
+        # Only the first and last parts are used, so partition instead of splitting every part.
+        head, tail, rest = "", "", value
+        # Skip empty parts at either end (", London, UK,") to reach the first and last real ones.
+        while rest and not head:
+            head, _, rest = rest.partition(",")
+            head = head.strip()
+        while rest and not tail:
+            rest, _, tail = rest.rpartition(",")
+            tail = tail.strip()
+        if head:
+            metadata["city"] = metadata["city"] or head
+            if tail:
+                metadata["country"] = metadata["country"] or tail
+                logger.info(f"Derived city/country: {metadata['city']}, {metadata['country']}")
+    return True
+
+def apply_fallback_markers(metadata: Dict[str, Optional[str]], text: str):
+    """Fills empty metadata fields from "Label: value" markers found in a single pass over text."""
+    for match in _FALLBACK_MARKER_RE.finditer(text):
+        label, value = match.group(1, 2) if match.group(1) else match.group(3, 4)
+        apply_metadata_label(metadata, label, value, "Fallback found")
+
+def selector_assignments_js(embed_selector: str, target_image_id: Optional[str], canvas_format: str) -> str:
+    """Serializes the per-URL target globals read by the injected script."""
+    return (
+        f"window.__SMARTFRAME_EMBED_SELECTOR = {json.dumps(embed_selector)};"
+        f"window.__SMARTFRAME_TARGET_IMAGE_ID = {json.dumps(target_image_id)};"
+        f"window.__SMARTFRAME_TARGET_FORMAT = {json.dumps(canvas_format)};"
+    )
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalizes a URL so trivially different spellings of the same page compare equal.
+    Lowercases the scheme and host (not any user info), drops a trailing slash and the fragment.
+    Only used as a comparison key; the URL as listed is what gets loaded and reported.
+    """
+    parts = urlsplit(url.strip())
+    userinfo, at, host = parts.netloc.rpartition('@')
+    return urlunsplit((parts.scheme.lower(), f"{userinfo}{at}{host.lower()}", parts.path.rstrip('/'), parts.query, ''))
+
 def sanitize_filename(url_or_id):
     """
     Generates a sanitized filename from a URL or image ID.
     """
     if url_or_id:
-        filename = re.sub(r'[^a-zA-Z0-9.\-_]', '-', url_or_id)
-        filename = re.sub(r'-+', '-', filename).strip('-')
-        return filename
+        return _FILENAME_DASH_RUN_RE.sub('-', _FILENAME_UNSAFE_CHAR_RE.sub('-', url_or_id)).strip('-')
     return "unknown_image"
 
-def download_thumbnail(url: str, output_path: Path):
+def encode_json_line(record: Dict[str, Any]) -> bytes:
+    """
+    Serializes a record as a single UTF-8 JSON line.
+    Uses orjson when it is installed and falls back to the standard library otherwise.
+    """
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+
+def format_result_row(result: Dict[str, Any]) -> Tuple[str, ...]:
+    """Flattens a per-URL result into a tuple ordered like RESULT_FIELDS."""
+    return tuple(result.get(field, "N/A") for field in RESULT_FIELDS)
+
+def open_results_file(results_path: Path, results_format: str):
+    """
+    Opens the per-URL results file and returns it with a function that appends one record.
+    CSV output writes the fixed RESULT_FIELDS header once and each record as a plain row.
+    """
+    if results_format == "csv":
+        results_file = open(results_path, 'w', encoding='utf-8', newline='')
+        writer = csv.writer(results_file)
+        writer.writerow(RESULT_FIELDS)
+
+        def write_record(record: Dict[str, Any]):
+            writer.writerow(format_result_row(record))
+            results_file.flush()
+    else:
+        results_file = open(results_path, 'wb')
+
+        def write_record(record: Dict[str, Any]):
+            results_file.write(encode_json_line(record))
+            results_file.flush()
+
+    return results_file, write_record
+
+def ndjson_to_json_array(ndjson_path: Path, json_path: Path):
+    """
+    Joins already-serialized NDJSON lines into a single JSON array file.
+    The records are copied as bytes, so nothing is decoded or re-encoded.
+    """
+    with open(ndjson_path, 'rb') as source, open(json_path, 'wb') as target:
+        target.write(b'[')
+        first = True
+        for line in source:
+            line = line.rstrip()
+            if not line:
+                continue
+            if not first:
+                target.write(b',')
+            target.write(line)
+            first = False
+        target.write(b']\n')
+
+def load_reusable_results(results_path: Path, results_format: str, output_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Reads the results file left by a previous run and returns its successful records by canonical
+    URL, keeping only those whose output image is still on disk so those URLs can be skipped.
+    """
+    if not results_path.is_file():
+        return {}
+    try:
+        with open(results_path, 'r', encoding='utf-8', newline='') as previous:
+            if results_format == "csv":
+                records = list(csv.DictReader(previous))
+            elif results_format == "json":
+                records = json.load(previous)
+            else:
+                records = [json.loads(line) for line in previous if line.strip()]
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            raise ValueError("expected a list of result records")
+        return {
+            canonicalize_url(record["Original URL"]): record
+            for record in records
+            if record.get("Status") == "Success"
+            and record.get("Original URL")
+            and record.get("Output Filename")
+            and (output_dir / record["Output Filename"]).is_file()
+        }
+    except Exception as e:
+        logger.warning(f"Could not read previous results from {results_path}: {e}. Processing every URL.")
+        return {}
+
+def download_thumbnail(url: str, output_path: Path, session: Optional[requests.Session] = None):
     """
     Downloads a thumbnail image using the requests library.
+    Reuses the given session's pooled connections when provided.
     Returns True on success, False on failure.
     """
     logger.info(f"Attempting to download thumbnail from: {url}")
     try:
-        response = requests.get(url, timeout=THUMBNAIL_DOWNLOAD_TIMEOUT, stream=True)
+        response = (session or requests).get(url, timeout=THUMBNAIL_DOWNLOAD_TIMEOUT, stream=True)
         response.raise_for_status()
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        content_length = response.headers.get('Content-Length')
+        if content_length and content_length.isdigit() and int(content_length) <= THUMBNAIL_SINGLE_READ_MAX_BYTES:
+            # Small body of known size: read it in one go and write it with a single call.
+            output_path.write_bytes(response.content)
+        else:
+            with open(output_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=THUMBNAIL_CHUNK_SIZE):
+                    f.write(chunk)
         logger.info(f"Thumbnail downloaded successfully to: {output_path}")
         return True
     except requests.exceptions.RequestException as e:
@@ -543,14 +941,74 @@ def download_thumbnail(url: str, output_path: Path):
         logger.error(f"An unexpected error occurred during thumbnail download: {e}", exc_info=True)
         return False
 
+# Tags describing the source thumbnail itself (its embedded preview, size and orientation) that
+# would be wrong on the full-size capture. ExifTool's -tagsFromFile already skips the preview and
+# size tags, and is told to skip Orientation, so both transfer paths copy the same set.
+THUMBNAIL_ONLY_TAG_PREFIXES = ("Exif.Thumbnail.",)
+THUMBNAIL_ONLY_TAGS = frozenset({
+    "Exif.Image.Orientation",
+    "Exif.Image.ImageWidth",
+    "Exif.Image.ImageLength",
+    "Exif.Photo.PixelXDimension",
+    "Exif.Photo.PixelYDimension",
+    "Xmp.tiff.Orientation",
+    "Xmp.tiff.ImageWidth",
+    "Xmp.tiff.ImageLength",
+    "Xmp.exif.PixelXDimension",
+    "Xmp.exif.PixelYDimension",
+})
+
+def without_thumbnail_only_tags(tags: Dict[str, Any]) -> Dict[str, Any]:
+    """Drops the tags in THUMBNAIL_ONLY_TAGS and under THUMBNAIL_ONLY_TAG_PREFIXES."""
+    return {
+        key: value for key, value in tags.items()
+        if key not in THUMBNAIL_ONLY_TAGS and not key.startswith(THUMBNAIL_ONLY_TAG_PREFIXES)
+    }
+
+def transfer_metadata_with_pyexiv2(source_image: Path, target_image: Path):
+    """
+    Copies EXIF, IPTC and XMP metadata from a source image to a target image in-process via pyexiv2.
+    Tags that only describe the source thumbnail are left out. Raises on failure so the caller
+    can fall back to ExifTool.
+    """
+    source = pyexiv2.Image(str(source_image))
+    try:
+        exif = without_thumbnail_only_tags(source.read_exif())
+        iptc = source.read_iptc()
+        xmp = without_thumbnail_only_tags(source.read_xmp())
+    finally:
+        source.close()
+
+    target = pyexiv2.Image(str(target_image))
+    try:
+        if exif:
+            target.modify_exif(exif)
+        if iptc:
+            target.modify_iptc(iptc)
+        if xmp:
+            target.modify_xmp(xmp)
+    finally:
+        target.close()
+
 def transfer_metadata_with_exiftool(source_image: Path, target_image: Path):
     """
-    Transfers metadata from a source image to a target image using ExifTool.
+    Transfers metadata from a source image to a target image.
+    Uses pyexiv2 in-process when it is installed, avoiding an ExifTool process per image,
+    and falls back to the ExifTool command otherwise.
     Returns True on success, False on failure.
     """
+    if pyexiv2 is not None:
+        logger.info(f"Transferring metadata from '{source_image}' to '{target_image}' using pyexiv2.")
+        try:
+            transfer_metadata_with_pyexiv2(source_image, target_image)
+            logger.info("Metadata transfer complete.")
+            return True
+        except Exception as e:
+            logger.warning(f"pyexiv2 metadata transfer failed ({e}); falling back to ExifTool.")
+
     logger.info(f"Transferring metadata from '{source_image}' to '{target_image}' using ExifTool.")
     try:
-        command = ['exiftool', '-tagsFromFile', str(source_image), '-overwrite_original', str(target_image)]
+        command = ['exiftool', '-tagsFromFile', str(source_image), '--Orientation', '-overwrite_original', str(target_image)]
         result = subprocess.run(command, capture_output=True, text=True, check=True)
         logger.info(f"ExifTool stdout:\n{result.stdout.strip()}")
         if result.stderr:
@@ -567,25 +1025,66 @@ def transfer_metadata_with_exiftool(source_image: Path, target_image: Path):
         logger.error(f"An unexpected error occurred during ExifTool operation: {e}", exc_info=True)
         return False
 
-def convert_png_to_jpg(png_path: Path, jpg_path: Path):
+def convert_png_to_jpg(png_data: bytes, jpg_path: Path):
     """
-    Converts a PNG image to JPG format using Pillow.
+    Converts in-memory PNG bytes to a JPG file using Pillow, without writing the PNG to disk.
     Returns True on success, False on failure.
     """
-    logger.info(f"Converting '{png_path}' to JPG: '{jpg_path}'")
+    logger.info(f"Converting {len(png_data)} bytes of PNG data to JPG: '{jpg_path}'")
     try:
-        with Image.open(png_path) as img:
+        with Image.open(io.BytesIO(png_data)) as img:
             if img.mode == 'RGBA':
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                background.paste(img, mask=img.split()[3])
-                img = background
-            img.save(jpg_path, 'jpeg', quality=95)
+                alpha_min, _ = img.getchannel('A').getextrema()
+                if alpha_min == 255:
+                    # Canvas captures are normally fully opaque: a plain RGB conversion drops alpha.
+                    img = img.convert('RGB')
+                else:
+                    # alpha_composite avoids split() materializing four separate band images.
+                    background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+                    img = Image.alpha_composite(background, img).convert('RGB')
+            img.save(jpg_path, 'jpeg', quality=95, optimize=False, progressive=False)
         logger.info("Image conversion successful.")
         return True
     except Exception as e:
         logger.error(f"Error converting image from PNG to JPG: {e}", exc_info=True)
         return False
 
+def log_imaging_backend():
+    """Logs which Pillow build and JPEG codec are active, so SIMD builds can be confirmed."""
+    try:
+        libjpeg_turbo = pil_features.check_feature('libjpeg_turbo')
+    except Exception:
+        libjpeg_turbo = None
+    logger.info(f"Imaging backend: Pillow {PIL.__version__}, libjpeg-turbo: {libjpeg_turbo}")
+
+def flush_log_queue():
+    """Waits until every queued log record has been written, e.g. before printing the summary."""
+    log_listener.stop()
+    log_listener.start()
+
+def init_cpu_worker(worker_log_queue):
+    """
+    Sends a pool worker's log records back to the parent through worker_log_queue, so only
+    the parent process writes to the console and the rotating log file.
+    """
+    logger.removeHandler(queue_handler)
+    logger.addHandler(logging.handlers.QueueHandler(worker_log_queue))
+
+@contextlib.contextmanager
+def forward_worker_logs(mp_context):
+    """
+    Yields a multiprocessing queue for pool workers to log into (see init_cpu_worker) while a
+    listener in this process writes its records to the console and file handlers.
+    """
+    worker_log_queue = mp_context.Queue()
+    listener = logging.handlers.QueueListener(worker_log_queue, ch, mh, respect_handler_level=True)
+    listener.start()
+    try:
+        yield worker_log_queue
+    finally:
+        listener.stop()
+        worker_log_queue.close()
+
 def setup_extension_files(extension_dir: Path):
     """Creates the extension directory and writes the necessary files."""
     if extension_dir.exists():
@@ -613,20 +1112,22 @@ async def get_thumbnail_url_from_page(page, page_url):
     """
     logger.info("Attempting to extract thumbnail URL from page metadata.")
     try:
-        og_image = page.locator('meta[property="og:image"]')
-        if await og_image.count() > 0:
-            thumbnail_url = await og_image.get_attribute('content')
+        # Read both meta tags in a single evaluate instead of four locator round-trips.
+        candidates = await page.evaluate("""() => {
+            const content = (selector) => {
+                const meta = document.querySelector(selector);
+                return meta ? meta.getAttribute('content') : null;
+            };
+            return {
+                og: content('meta[property="og:image"]'),
+                twitter: content('meta[name="twitter:image"]')
+            };
+        }""")
+        for source, key in (("og:image", "og"), ("twitter:image", "twitter")):
+            thumbnail_url = candidates.get(key)
             if thumbnail_url:
                 thumbnail_url = urljoin(page_url, thumbnail_url)
-                logger.info(f"Found thumbnail URL from og:image: {thumbnail_url}")
-                return thumbnail_url
-        
-        twitter_image = page.locator('meta[name="twitter:image"]')
-        if await twitter_image.count() > 0:
-            thumbnail_url = await twitter_image.get_attribute('content')
-            if thumbnail_url:
-                thumbnail_url = urljoin(page_url, thumbnail_url)
-                logger.info(f"Found thumbnail URL from twitter:image: {thumbnail_url}")
+                logger.info(f"Found thumbnail URL from {source}: {thumbnail_url}")
                 return thumbnail_url
         
         logger.warning("No thumbnail URL found in page metadata.")
@@ -635,115 +1136,80 @@ async def get_thumbnail_url_from_page(page, page_url):
         logger.error(f"Error extracting thumbnail URL: {e}", exc_info=True)
         return None
 
+async def download_canvas_blob(page, blob_url: str) -> bytes:
+    """
+    Fetches the canvas blob exposed by the extension through a browser download.
+    Chromium writes the binary file itself, so no base64 payload crosses the Playwright connection.
+    Returns the encoded image bytes.
+    """
+    async with page.expect_download(timeout=120000) as download_info:
+        await page.evaluate("""(blobUrl) => {
+            const link = document.createElement('a');
+            link.href = blobUrl;
+            link.download = 'smartframe-canvas';
+            document.body.appendChild(link);
+            link.click();
+            link.remove();
+        }""", blob_url)
+    download = await download_info.value
+    try:
+        return Path(await download.path()).read_bytes()
+    finally:
+        await download.delete()
+        await page.evaluate("(blobUrl) => URL.revokeObjectURL(blobUrl)", blob_url)
+
 async def extract_smartframe_metadata(page, page_url):
     """
     Extracts metadata from SmartFrame.com pages specifically.
     Returns a dictionary with Caption, Date, Credit, and other metadata.
     """
-    metadata = {
-        "caption": None,
-        "date": None,
-        "credit": None,
-        "image_id": None,
-        "image_size": None,
-        "provider": None,
-        "location": None,
-        "city": None,
-        "country": None,
-        "photographer": None,
-        "featuring": None,
-        "title": None,
-        "subject": None
-    }
+    metadata: Dict[str, Optional[str]] = dict.fromkeys(METADATA_FIELDS)
     
     if "smartframe.com" not in page_url:
         logger.info("URL is not from smartframe.com, skipping SmartFrame-specific metadata extraction.")
         return metadata
     
     logger.info("Extracting SmartFrame.com metadata from page...")
+    body_text: Optional[str] = None
     try:
-        # Attempt structured extraction using observed SmartFrame layout
-        metadata_container = page.locator("div.flex.flex-col.gap-4x").first
-        if await metadata_container.count() > 0:
+        # Attempt structured extraction using observed SmartFrame layout.
+        # One evaluate reads every structured field instead of a locator round-trip per field.
+        snapshot = await page.evaluate(SMARTFRAME_METADATA_JAVASCRIPT)
+        structured = snapshot["structured"]
+        body_text = snapshot["bodyText"]
+        if structured:
             logger.info("Structured metadata container found.")
             
             try:
-                provider_locator = metadata_container.locator("section").nth(0).locator("h2").first
-                provider_text = await provider_locator.text_content(timeout=3000)
+                provider_text = structured["provider"]
                 if provider_text:
-                    provider_text = provider_text.strip()
-                    if provider_text:
-                        metadata["provider"] = provider_text
-                        logger.info(f"Found provider: {metadata['provider']}")
+                    metadata["provider"] = provider_text
+                    logger.info(f"Found provider: {metadata['provider']}")
             except Exception as e:
                 logger.debug(f"Structured provider extraction failed: {e}")
             
             try:
-                caption_locator = metadata_container.locator("section").nth(1).locator("h1").first
-                caption_text = await caption_locator.text_content(timeout=3000)
+                caption_text = structured["caption"]
                 if caption_text:
-                    caption_text = caption_text.strip()
-                    if caption_text:
-                        metadata["caption"] = caption_text
-                        logger.info(f"Found caption: {metadata['caption']}")
+                    metadata["caption"] = caption_text
+                    logger.info(f"Found caption: {metadata['caption']}")
             except Exception as e:
                 logger.debug(f"Structured caption extraction failed: {e}")
             
             try:
-                details_paragraph = metadata_container.locator("section").nth(1).locator("p").first
-                details_text = await details_paragraph.inner_text(timeout=3000)
+                details_text = structured["details"]
                 if details_text:
-                    normalized_text = details_text.replace('\xa0', ' ')
-                    markers = ("Featuring:", "Where:", "When:", "Credit:", "SmartFrame image ID:", "Image size:")
-                    for marker in markers:
-                        normalized_text = normalized_text.replace(f" {marker}", f"\n{marker}")
-                    # Collect any narrative sentences that appear before the structured
-                    # metadata markers (e.g. "When:", "Credit:"). These are typically the
-                    # descriptive sentences SmartFrame shows on the page and should flow
-                    # into the caption, title, and subject fields.
-                    preface_lines: List[str] = []
-                    metadata_section_started = False
-                    for raw_line in normalized_text.splitlines():
-                        line = raw_line.strip()
-                        if not line:
-                            continue
-
-                        line_starts_with_marker = any(line.startswith(marker) for marker in markers)
-                        if not metadata_section_started and not line_starts_with_marker:
-                            preface_lines.append(line)
-                            continue
-
-                        if line_starts_with_marker:
-                            metadata_section_started = True
-
-                        if line.startswith("When:") and not metadata["date"]:
-                            metadata["date"] = line.replace("When:", "").strip()
-                            logger.info(f"Found date: {metadata['date']}")
-                        elif line.startswith("Credit:") and not metadata["credit"]:
-                            metadata["credit"] = line.replace("Credit:", "").strip()
-                            logger.info(f"Found credit: {metadata['credit']}")
-                        elif line.startswith("Featuring:") and not metadata["featuring"]:
-                            metadata["featuring"] = line.replace("Featuring:", "").strip()
-                            logger.info(f"Found featuring: {metadata['featuring']}")
-                        elif line.startswith("Where:") and not metadata["location"]:
-                            location_value = line.replace("Where:", "").strip()
-                            metadata["location"] = location_value
-                            logger.info(f"Found location: {metadata['location']}")
-                            if not metadata["city"] or not metadata["country"]:
-                                parts = [part.strip() for part in location_value.split(",") if part.strip()]
-                                if parts:
-                                    if len(parts) == 1:
-                                        metadata["city"] = metadata["city"] or parts[0]
-                                    else:
-                                        metadata["city"] = metadata["city"] or parts[0]
-                                        metadata["country"] = metadata["country"] or parts[-1]
-                                        logger.info(f"Derived city/country: {metadata['city']}, {metadata['country']}")
-                        elif line.startswith("SmartFrame image ID:") and not metadata["image_id"]:
-                            metadata["image_id"] = line.replace("SmartFrame image ID:", "").strip()
-                            logger.info(f"Found image ID from paragraph: {metadata['image_id']}")
-                        elif line.startswith("Image size:") and not metadata["image_size"]:
-                            metadata["image_size"] = line.replace("Image size:", "").strip()
-                            logger.info(f"Found image size: {metadata['image_size']}")
+                    normalized_text = _DETAIL_MARKER_BREAK_RE.sub("\n", details_text.replace('\xa0', ' '))
+                    # One scan finds every marker line. Any narrative sentences that appear before
+                    # the first marker (e.g. "When:", "Credit:") are typically the descriptive
+                    # sentences SmartFrame shows on the page and should flow into the caption,
+                    # title, and subject fields.
+                    marker_matches = list(_DETAIL_MARKER_LINE_RE.finditer(normalized_text))
+                    preface_end = marker_matches[0].start() if marker_matches else len(normalized_text)
+                    preface_lines: List[str] = _NONEMPTY_LINE_RE.findall(normalized_text, 0, preface_end)
+
+                    for match in marker_matches:
+                        apply_metadata_label(metadata, match.group(1), match.group(2))
 
                     if preface_lines:
                         preface_text = " | ".join(preface_lines)
@@ -762,36 +1228,13 @@ async def extract_smartframe_metadata(page, page_url):
                 logger.debug(f"Structured detail extraction failed: {e}")
             
             try:
-                info_items = await metadata_container.locator("section.bg-iy-neutral-100 li").all_text_contents()
+                # The paragraph usually fills these already; only walk the list for what is missing.
+                needs_list = not all(metadata[key] for key in INFO_LIST_FIELDS)
+                info_items = structured["items"] if needs_list else []
+                # Items arrive trimmed, single-spaced and already known to contain a colon.
                 for item in info_items:
-                    if not item:
-                        continue
-                    text = item.strip()
-                    if not text:
-                        continue
-                    normalized = " ".join(text.split())
-                    if ":" in normalized:
-                        label, value = normalized.split(":", 1)
-                        label = label.strip().lower()
-                        value = value.strip()
-                        if label == "smartframe image id" and not metadata["image_id"]:
-                            metadata["image_id"] = value
-                            logger.info(f"Found image ID from list: {metadata['image_id']}")
-                        elif label == "image size" and not metadata["image_size"]:
-                            metadata["image_size"] = value
-                            logger.info(f"Found image size from list: {metadata['image_size']}")
-                        elif label == "credit" and not metadata["credit"]:
-                            metadata["credit"] = value
-                            logger.info(f"Found credit from list: {metadata['credit']}")
-                        elif label == "photographer" and not metadata["photographer"]:
-                            metadata["photographer"] = value
-                            logger.info(f"Found photographer: {metadata['photographer']}")
-                        elif label == "country" and not metadata["country"]:
-                            metadata["country"] = value
-                            logger.info(f"Found country: {metadata['country']}")
-                        elif label == "city" and not metadata["city"]:
-                            metadata["city"] = value
-                            logger.info(f"Found city: {metadata['city']}")
+                    label, value = item.split(":", 1)
+                    apply_metadata_label(metadata, label.strip(), value, "List found")
             except Exception as e:
                 logger.debug(f"Structured list extraction failed: {e}")
         
@@ -803,62 +1246,28 @@ async def extract_smartframe_metadata(page, page_url):
     if missing_fields:
         logger.info(f"Attempting fallback metadata extraction for missing fields: {missing_fields}")
         try:
-            full_text = await page.inner_text("body", timeout=5000)
-            lines = full_text.split('\n')
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                if not metadata["date"] and line.startswith("When:"):
-                    metadata["date"] = line.replace("When:", "").strip()
-                    logger.info(f"Fallback found date: {metadata['date']}")
-                elif not metadata["credit"] and line.startswith("Credit:"):
-                    metadata["credit"] = line.replace("Credit:", "").strip()
-                    logger.info(f"Fallback found credit: {metadata['credit']}")
-                elif not metadata["featuring"] and line.startswith("Featuring:"):
-                    metadata["featuring"] = line.replace("Featuring:", "").strip()
-                    logger.info(f"Fallback found featuring: {metadata['featuring']}")
-                elif not metadata["location"] and line.startswith("Where:"):
-                    location_value = line.replace("Where:", "").strip()
-                    metadata["location"] = location_value
-                    logger.info(f"Fallback found location: {metadata['location']}")
-                    parts = [part.strip() for part in location_value.split(",") if part.strip()]
-                    if parts:
-                        if len(parts) == 1 and not metadata["city"]:
-                            metadata["city"] = parts[0]
-                        else:
-                            if not metadata["city"]:
-                                metadata["city"] = parts[0]
-                            if not metadata["country"]:
-                                metadata["country"] = parts[-1]
-                            logger.info(f"Fallback derived city/country: {metadata['city']}, {metadata['country']}")
-                elif not metadata["image_id"] and "SmartFrame image ID:" in line:
-                    metadata["image_id"] = line.split("SmartFrame image ID:")[-1].strip()
-                    logger.info(f"Fallback found image ID: {metadata['image_id']}")
-                elif not metadata["image_size"] and "Image size:" in line:
-                    metadata["image_size"] = line.split("Image size:")[-1].strip()
-                    logger.info(f"Fallback found image size: {metadata['image_size']}")
-                elif not metadata["photographer"] and line.startswith("Photographer:"):
-                    metadata["photographer"] = line.replace("Photographer:", "").strip()
-                    logger.info(f"Fallback found photographer: {metadata['photographer']}")
-                elif not metadata["country"] and line.startswith("Country:"):
-                    metadata["country"] = line.replace("Country:", "").strip()
-                    logger.info(f"Fallback found country: {metadata['country']}")
-                elif not metadata["city"] and line.startswith("City:"):
-                    metadata["city"] = line.replace("City:", "").strip()
-                    logger.info(f"Fallback found city: {metadata['city']}")
+            full_text = body_text if body_text is not None else await page.inner_text("body", timeout=5000)
+            apply_fallback_markers(metadata, full_text)
             
             if not metadata["caption"] and metadata["provider"]:
-                for i, line in enumerate(lines):
-                    if line.strip() == metadata["provider"]:
-                        if i + 1 < len(lines):
-                            potential_caption = lines[i + 1].strip()
-                            if potential_caption and not potential_caption.startswith("When:") and not potential_caption.startswith("Credit:") and len(potential_caption) > MIN_CAPTION_LENGTH:
-                                metadata["caption"] = potential_caption
-                                logger.info(f"Fallback found caption: {metadata['caption']}")
-                                break
+                # Jump between occurrences of the provider name with str.find instead of walking
+                # every line; the caption is the line after a line holding just the provider.
+                provider = metadata["provider"]
+                search_from = 0
+                while (index := full_text.find(provider, search_from)) != -1:
+                    search_from = index + len(provider)
+                    line_start = full_text.rfind('\n', 0, index) + 1
+                    line_end = full_text.find('\n', search_from)
+                    if line_end == -1:
+                        break
+                    if full_text[line_start:index].strip() or full_text[search_from:line_end].strip():
+                        continue
+                    next_line_end = full_text.find('\n', line_end + 1)
+                    potential_caption = full_text[line_end + 1:next_line_end if next_line_end != -1 else len(full_text)].strip()
+                    if potential_caption and not potential_caption.startswith(CAPTION_EXCLUDED_PREFIXES) and len(potential_caption) > MIN_CAPTION_LENGTH:
+                        metadata["caption"] = potential_caption
+                        logger.info(f"Fallback found caption: {metadata['caption']}")
+                        break
             if metadata["caption"]:
                 if not metadata["title"]:
                     metadata["title"] = metadata["caption"]
@@ -876,13 +1285,15 @@ def save_metadata_to_file(metadata: Dict[str, Any], output_path: Path):
     """
     metadata_path = output_path.with_suffix('.txt')
     try:
+        lines = ["SmartFrame Image Metadata", "=" * METADATA_SEPARATOR_LENGTH, ""]
+        # Skip image_size as requested by user
+        lines.extend(
+            f"{METADATA_FILE_LABELS.get(key) or key.replace('_', ' ').title() + ': '}{value}"
+            for key, value in metadata.items()
+            if value and key != 'image_size'
+        )
         with open(metadata_path, 'w', encoding='utf-8') as f:
-            f.write("SmartFrame Image Metadata\n")
-            f.write("=" * METADATA_SEPARATOR_LENGTH + "\n\n")
-            for key, value in metadata.items():
-                # Skip image_size as requested by user
-                if value and key != 'image_size':
-                    f.write(f"{key.replace('_', ' ').title()}: {value}\n")
+            f.write("\n".join(lines) + "\n")
         logger.info(f"Metadata saved to: {metadata_path}")
         return True
     except Exception as e:
@@ -895,21 +1306,20 @@ def write_failed_download_report(results: List[Dict[str, Any]], output_path: Pat
     """
     try:
         output_path = output_path.resolve()
+        failed = [res for res in results if res.get("Status") != "Success"]
+        if not results:
+            lines = ["The extractor did not attempt any downloads."]
+        elif not failed:
+            lines = ["All downloads succeeded."]
+        else:
+            lines = ["Failed SmartFrame downloads:"]
+            for item in failed:
+                original_url = item.get("Original URL", "Unknown URL")
+                error_message = item.get("Error Message") or "No additional error details."
+                lines.append(f"- {original_url}\n    Reason: {error_message}")
+        # The report is assembled first and written in one call.
         with open(output_path, 'w', encoding='utf-8') as report:
-            if not results:
-                report.write("The extractor did not attempt any downloads.\n")
-                logger.info(f"Failed download report written to: {output_path}")
-                return True
-
-            failed = [res for res in results if res.get("Status") != "Success"]
-            if not failed:
-                report.write("All downloads succeeded.\n")
-            else:
-                report.write("Failed SmartFrame downloads:\n")
-                for item in failed:
-                    original_url = item.get("Original URL", "Unknown URL")
-                    error_message = item.get("Error Message") or "No additional error details."
-                    report.write(f"- {original_url}\n    Reason: {error_message}\n")
+            report.write("\n".join(lines) + "\n")
 
         logger.info(f"Failed download report written to: {output_path}")
         return True
@@ -917,6 +1327,37 @@ def write_failed_download_report(results: List[Dict[str, Any]], output_path: Pat
         logger.error(f"Unable to write failed download report to {output_path}: {exc}", exc_info=True)
         return False
 
+@functools.lru_cache(maxsize=2048)
+def parse_date(date_str: str) -> datetime.datetime:
+    """
+    Parses a date string, remembering the result for repeated values within a run.
+    ISO 8601 strings go through datetime.fromisoformat and day-first dotted dates are built
+    directly; anything else uses dateutil's fuzzy parser.
+    """
+    stripped = date_str.strip()
+    if _ISO_DATETIME_RE.fullmatch(stripped):
+        try:
+            # fromisoformat only accepts a trailing "Z" from Python 3.11 on.
+            return datetime.datetime.fromisoformat(stripped[:-1] + "+00:00" if stripped.endswith("Z") else stripped)
+        except ValueError:
+            pass
+    dotted = _DOTTED_DATE_RE.fullmatch(stripped)
+    if dotted:
+        day, month, year = map(int, dotted.groups())
+        if year < 100:
+            # Same pivot as dateutil: the two-digit year lands within 50 years of the current one.
+            this_year = datetime.date.today().year
+            year += this_year // 100 * 100
+            if year >= this_year + 50:
+                year -= 100
+            elif year < this_year - 50:
+                year += 100
+        try:
+            return datetime.datetime(year, month, day)
+        except ValueError:
+            pass
+    return date_parser.parse(date_str, fuzzy=True)
+
 def parse_date_components(date_str: str) -> Optional[Dict[str, str]]:
     """
     Parse various date formats and convert them into structured components suitable for
@@ -932,7 +1373,7 @@ def parse_date_components(date_str: str) -> Optional[Dict[str, str]]:
         return None
     
     try:
-        parsed_date = date_parser.parse(date_str, fuzzy=True)
+        parsed_date = parse_date(date_str)
     except Exception as e:
         logger.warning(f"Could not parse date '{date_str}' into structured components: {e}")
         return None
@@ -970,10 +1411,102 @@ def parse_date_components(date_str: str) -> Optional[Dict[str, str]]:
         "xmp_datetime": xmp_datetime
     }
 
-def write_metadata_to_image(metadata: Dict[str, Any], image_path: Path):
+def format_argfile_argument(argument: str) -> str:
+    """
+    Formats one argument as a line of an ExifTool -@ argument file.
+    Values containing line breaks are written as #[CSTR] C strings so they stay on one line.
+    """
+    if "\n" in argument or "\r" in argument:
+        return "#[CSTR]" + argument.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r")
+    return argument
+
+class ExifToolDaemon:
+    """
+    Keeps one `exiftool -stay_open` process for a whole run and sends it one command per image,
+    so Perl start-up and tag-table loading are paid once instead of per image.
+    Commands are serialized with a lock, so one instance can be shared by worker threads.
+    """
+
+    def __init__(self, executable: str = "exiftool"):
+        self.executable = executable
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._sequence = 0
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def __enter__(self) -> "ExifToolDaemon":
+        try:
+            self._process = subprocess.Popen(
+                [self.executable, "-stay_open", "True", "-@", "-"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                encoding="utf-8",
+                errors="replace"
+            )
+            logger.info("Started persistent ExifTool process.")
+        except OSError as e:
+            logger.warning(f"Could not start persistent ExifTool process, falling back to one process per image: {e}")
+            self._process = None
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Asks ExifTool to exit, killing it if it does not stop promptly. Safe to call more than once."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            if process.poll() is None:
+                process.stdin.write("-stay_open\nFalse\n")
+                process.stdin.flush()
+                process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        logger.info("Stopped persistent ExifTool process.")
+
+    def execute(self, arguments: List[str]) -> Tuple[str, str]:
+        """
+        Runs one ExifTool command and returns its (stdout, stderr).
+        Raises subprocess.CalledProcessError when ExifTool reports an error.
+        """
+        with self._lock:
+            if not self.running:
+                raise OSError("ExifTool process is not running")
+            self._sequence += 1
+            ready_marker = f"{{ready{self._sequence}}}"
+            lines = [format_argfile_argument(argument) for argument in arguments]
+            # -echo4 prints the marker on stderr once the command finishes, so both streams can be
+            # read up to a known point without closing them.
+            lines.extend(["-echo4", ready_marker, f"-execute{self._sequence}"])
+            self._process.stdin.write("\n".join(lines) + "\n")
+            self._process.stdin.flush()
+            stdout = self._read_until(self._process.stdout, ready_marker)
+            stderr = self._read_until(self._process.stderr, ready_marker)
+        if "Error:" in stderr or "weren't updated" in stdout:
+            raise subprocess.CalledProcessError(1, [self.executable, *arguments], output=stdout, stderr=stderr)
+        return stdout, stderr
+
+    @staticmethod
+    def _read_until(stream, marker: str) -> str:
+        collected: List[str] = []
+        for line in iter(stream.readline, ""):
+            if line.rstrip("\r\n") == marker:
+                return "".join(collected)
+            collected.append(line)
+        raise OSError("ExifTool process exited unexpectedly")
+
+def write_metadata_to_image(metadata: Dict[str, Any], image_path: Path, exiftool: Optional[ExifToolDaemon] = None):
     """
     Writes SmartFrame metadata into the image EXIF/IPTC fields using ExifTool.
-    Maps extracted metadata to appropriate EXIF/IPTC/XMP fields.
+    Maps extracted metadata to appropriate EXIF/IPTC/XMP fields. Uses the persistent
+    exiftool process when one is running, otherwise starts ExifTool for this image.
     Returns True on success, False on failure.
     """
     if not metadata or not any(metadata.values()):
@@ -987,48 +1520,10 @@ def write_metadata_to_image(metadata: Dict[str, Any], image_path: Path):
         
         # Map SmartFrame metadata to EXIF/IPTC/XMP fields
         # IPTC fields are widely supported and recommended for editorial images
-        
-        if metadata.get('caption'):
-            # Caption/Description fields
-            command.extend([
-                f'-IPTC:Caption-Abstract={metadata["caption"]}',
-                f'-XMP:Description={metadata["caption"]}',
-                f'-EXIF:ImageDescription={metadata["caption"]}'
-            ])
-        
-        if metadata.get('title'):
-            # Headline/Title fields (IPTC ObjectName & Headline, plus XMP/EXIF equivalents)
-            command.extend([
-                f'-IPTC:ObjectName={metadata["title"]}',
-                f'-IPTC:Headline={metadata["title"]}',
-                f'-XMP:Title={metadata["title"]}',
-                f'-XMP-photoshop:Headline={metadata["title"]}',
-                f'-EXIF:XPTitle={metadata["title"]}'
-            ])
-        
-        if metadata.get('subject'):
-            # Store the subject as both XMP subject and IPTC keyword for wider compatibility
-            command.extend([
-                f'-XMP:Subject={metadata["subject"]}',
-                f'-IPTC:Keywords={metadata["subject"]}'
-            ])
-        
-        if metadata.get('credit'):
-            # Credit/Source fields and Author field
-            command.extend([
-                f'-IPTC:Credit={metadata["credit"]}',
-                f'-IPTC:By-line={metadata["credit"]}',
-                f'-XMP:Credit={metadata["credit"]}',
-                f'-EXIF:Artist={metadata["credit"]}',
-                f'-XMP:Creator={metadata["credit"]}'
-            ])
-        
-        if metadata.get('provider'):
-            # Source/Provider fields
-            command.extend([
-                f'-IPTC:Source={metadata["provider"]}',
-                f'-XMP:Source={metadata["provider"]}'
-            ])
+        for key, tags in METADATA_TAG_MAP.items():
+            value = metadata.get(key)
+            if value:
+                command.extend(f'-{tag}={value}' for tag in tags)
         
         if metadata.get('date'):
             parsed_components = parse_date_components(metadata["date"])
@@ -1058,73 +1553,52 @@ def write_metadata_to_image(metadata: Dict[str, Any], image_path: Path):
                         f'-XMP:DateCreated={cleaned_date}'
                     ])
         
-        if metadata.get('city'):
-            command.extend([
-                f'-IPTC:City={metadata["city"]}',
-                f'-XMP-photoshop:City={metadata["city"]}'
-            ])
-        
-        if metadata.get('country'):
-            command.extend([
-                f'-IPTC:Country-PrimaryLocationName={metadata["country"]}',
-                f'-XMP-photoshop:Country={metadata["country"]}'
-            ])
-        
-        if metadata.get('location'):
-            command.extend([
-                f'-IPTC:Sub-location={metadata["location"]}',
-                f'-XMP-photoshop:Location={metadata["location"]}'
-            ])
-        
-        if metadata.get('photographer'):
-            command.extend([
-                f'-XMP:Contributor={metadata["photographer"]}'
-            ])
-        
         if metadata.get('featuring'):
-            participants = [name.strip() for name in re.split(r',| and ', metadata["featuring"]) if name.strip()]
+            participants = [name.strip() for name in _FEATURING_SPLIT_RE.split(metadata["featuring"]) if name.strip()]
             if not participants:
                 participants = [metadata["featuring"].strip()]
             for person in participants:
                 command.append(f'-XMP:PersonInImage+={person}')
         
-        if metadata.get('image_id'):
-            # Image ID in custom fields
-            command.extend([
-                f'-XMP:Identifier={metadata["image_id"]}',
-                f'-IPTC:OriginalTransmissionReference={metadata["image_id"]}'
-            ])
-        
         # Create comprehensive Comments field with all metadata except image_size
+        caption = metadata.get('caption')
+        date = metadata.get('date')
+        credit = metadata.get('credit')
+        photographer = metadata.get('photographer')
+        image_id = metadata.get('image_id')
+        provider = metadata.get('provider')
+        city = metadata.get('city')
+        country = metadata.get('country')
+        location = metadata.get('location')
+        featuring = metadata.get('featuring')
+        subject = metadata.get('subject')
+        title = metadata.get('title')
+
         comments_parts = []
-        if metadata.get('caption'):
-            comments_parts.append(f"Caption: {metadata['caption']}")
-        if metadata.get('date'):
-            comments_parts.append(f"Date: {metadata['date']}")
-        if metadata.get('credit'):
-            comments_parts.append(f"Credit: {metadata['credit']}")
-        if metadata.get('photographer') and metadata.get('photographer') != metadata.get('credit'):
-            comments_parts.append(f"Photographer: {metadata['photographer']}")
-        if metadata.get('image_id'):
-            comments_parts.append(f"Image ID: {metadata['image_id']}")
-        if metadata.get('provider'):
-            comments_parts.append(f"Provider: {metadata['provider']}")
-        location_components = []
-        if metadata.get('city'):
-            location_components.append(metadata['city'])
-        if metadata.get('country'):
-            location_components.append(metadata['country'])
+        if caption:
+            comments_parts.append(f"Caption: {caption}")
+        if date:
+            comments_parts.append(f"Date: {date}")
+        if credit:
+            comments_parts.append(f"Credit: {credit}")
+        if photographer and photographer != credit:
+            comments_parts.append(f"Photographer: {photographer}")
+        if image_id:
+            comments_parts.append(f"Image ID: {image_id}")
+        if provider:
+            comments_parts.append(f"Provider: {provider}")
+        location_components = [part for part in (city, country) if part]
         if location_components:
             comments_parts.append(f"Location: {', '.join(location_components)}")
-        elif metadata.get('location'):
-            comments_parts.append(f"Location: {metadata['location']}")
-        if metadata.get('featuring'):
-            comments_parts.append(f"Featuring: {metadata['featuring']}")
+        elif location:
+            comments_parts.append(f"Location: {location}")
+        if featuring:
+            comments_parts.append(f"Featuring: {featuring}")
         # Avoid duplicating the caption text in the comments; only append when distinct.
-        if metadata.get('subject') and metadata['subject'] != metadata.get('caption'):
-            comments_parts.append(f"Subject: {metadata['subject']}")
-        if metadata.get('title') and metadata['title'] not in (metadata.get('caption'), metadata.get('subject')):
-            comments_parts.append(f"Title: {metadata['title']}")
+        if subject and subject != caption:
+            comments_parts.append(f"Subject: {subject}")
+        if title and title not in (caption, subject):
+            comments_parts.append(f"Title: {title}")
         
         if comments_parts:
             comments_text = " | ".join(comments_parts)
@@ -1137,10 +1611,14 @@ def write_metadata_to_image(metadata: Dict[str, Any], image_path: Path):
         command.append(str(image_path))
         
         # Execute ExifTool
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
-        logger.info(f"ExifTool stdout:\n{result.stdout.strip()}")
-        if result.stderr:
-            logger.warning(f"ExifTool stderr:\n{result.stderr.strip()}")
+        if exiftool is not None and exiftool.running:
+            stdout, stderr = exiftool.execute(command[1:])
+        else:
+            result = subprocess.run(command, capture_output=True, text=True, check=True)
+            stdout, stderr = result.stdout, result.stderr
+        logger.info(f"ExifTool stdout:\n{stdout.strip()}")
+        if stderr.strip():
+            logger.warning(f"ExifTool stderr:\n{stderr.strip()}")
         logger.info("SmartFrame metadata successfully written to image.")
         return True
         
@@ -1155,16 +1633,130 @@ def write_metadata_to_image(metadata: Dict[str, Any], image_path: Path):
         return False
 
 # --- Main Automation Logic ---
-async def process_url(
+async def launch_browser_context(playwright, user_data_dir: Path, extension_dir: Path, extra_args: Tuple[str, ...] = ()):
+    """
+    Launches the single persistent Chromium context shared by every URL in a run.
+    The extension and profile are loaded once; each URL gets its own page.
+    """
+    # CRITICAL: Large viewport (9999x9999) is required for SmartFrame to render
+    # the canvas at full resolution. The SmartFrame embed renders its canvas
+    # based on the actual viewport/display size, not just CSS dimensions.
+    browser_context = await playwright.chromium.launch_persistent_context(
+        user_data_dir=str(user_data_dir),
+        headless=False,
+        args=[
+            f'--disable-extensions-except={extension_dir.absolute()}',
+            f'--load-extension={extension_dir.absolute()}',
+            "--start-maximized",
+            *CHROMIUM_PERFORMANCE_ARGS,
+            *extra_args
+        ],
+        viewport={"width": 9999, "height": 9999},
+        ignore_https_errors=True
+    )
+    logger.info(f"Launched shared browser context with profile: {user_data_dir.absolute()}")
+    return browser_context
+
+class BrowserPool:
+    """
+    Owns one Playwright instance and one persistent Chromium context for a whole run.
+    Lends out pages via page(), capping open pages with a semaphore. Returned pages are kept
+    warm and reused most-recently-used first, and retired after max_page_reuses jobs.
+    """
+
+    def __init__(
+        self,
+        user_data_dir: Path,
+        extension_dir: Path,
+        max_pages: Optional[int] = None,
+        page_init_scripts: Tuple[str, ...] = (),
+        max_page_reuses: int = PAGE_MAX_REUSES,
+        block_requests: bool = True
+    ):
+        self.user_data_dir = user_data_dir
+        self.extension_dir = extension_dir
+        self.max_pages = max_pages or os.cpu_count() or 1
+        self.page_init_scripts = page_init_scripts
+        self.max_page_reuses = max_page_reuses
+        self.block_requests = block_requests
+        self._page_slots = asyncio.Semaphore(self.max_pages)
+        # Idle pages as (page, jobs served) pairs, used as a LIFO stack.
+        self._idle_pages: collections.deque = collections.deque()
+        self._playwright = None
+        self.context = None
+
+    async def __aenter__(self) -> "BrowserPool":
+        self._playwright = await async_playwright().start()
+        try:
+            extra_args = (blocked_hosts_switch(BLOCKED_REQUEST_HOSTS),) if self.block_requests else ()
+            self.context = await launch_browser_context(
+                self._playwright, self.user_data_dir, self.extension_dir, extra_args)
+        except Exception:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Closes the browser context and stops Playwright. Safe to call more than once."""
+        self._idle_pages.clear()
+        if self.context is not None:
+            await self.context.close()
+            self.context = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _new_page(self):
+        page = await self.context.new_page()
+        # Registered once per page rather than per job, so reused pages do not stack listeners.
+        # Console output is high-volume, so it uses lazy %-formatting instead of an f-string.
+        page.on("console", lambda msg: logger.info("Browser Console [%s]: %s", msg.type.upper(), msg.text))
+        for script in self.page_init_scripts:
+            await page.add_init_script(script)
+        return page
+
+    async def _release_page(self, page, uses: int, failed: bool):
+        """Parks a page on about:blank for reuse, or closes it if it failed or is worn out."""
+        if not failed and uses < self.max_page_reuses and not page.is_closed():
+            try:
+                await page.goto("about:blank")
+                self._idle_pages.append((page, uses))
+                return
+            except Exception as e:
+                logger.warning(f"Could not reset page for reuse, closing it: {e}")
+        if not page.is_closed():
+            await page.close()
+
+    @contextlib.asynccontextmanager
+    async def page(self):
+        """Yields the most recently used idle page (or a new one) and returns it to the pool on exit."""
+        async with self._page_slots:
+            if self._idle_pages:
+                page, uses = self._idle_pages.pop()
+            else:
+                page, uses = await self._new_page(), 0
+            failed = True
+            try:
+                yield page
+                failed = False
+            finally:
+                await self._release_page(page, uses + 1, failed)
+
+async def capture_page(
     target_url: str,
     output_dir_path: Path,
-    extension_dir: Path,
-    user_data_dir: Path,
-    temp_root_dir: Path,
-    thumbnail_url: Optional[str] = None
-) -> Dict[str, Any]:
+    browser_pool: "BrowserPool",
+    thumbnail_url: Optional[str] = None,
+    canvas_format: str = DEFAULT_CANVAS_FORMAT
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
     """
-    Automates the download of high-resolution images protected by SmartFrame for a single URL.
+    Browser stage: loads a URL on a pooled page, reads its metadata and downloads the canvas image
+    encoded in canvas_format.
+    The page goes back to the pool before any image encoding starts. Returns the result row and,
+    on success, the capture to hand to finish_capture (None otherwise).
     """
     page_result = {
         "Original URL": target_url,
@@ -1174,181 +1766,220 @@ async def process_url(
         "Error Message": ""
     }
     
-    parsed_target_url = urlparse(target_url)
+    # urlsplit skips urlparse's ";params" pass, which SmartFrame URLs never use.
+    parsed_target_url = urlsplit(target_url)
     netloc_lower = parsed_target_url.netloc.lower()
-    is_smartframe_url = netloc_lower == 'smartframe.com' or netloc_lower.endswith('.smartframe.com')
+    is_smartframe_url = _SMARTFRAME_HOST_RE.fullmatch(netloc_lower) is not None
     
     smartframe_target_image_id: Optional[str] = None
     smartframe_embed_selector = 'smartframe-embed'
     if is_smartframe_url:
-        path_segments = [segment for segment in parsed_target_url.path.split('/') if segment]
-        if path_segments:
-            potential_image_id = path_segments[-1]
-            if potential_image_id:
-                smartframe_target_image_id = potential_image_id
-                smartframe_embed_selector = f'smartframe-embed[image-id="{potential_image_id}"]'
+        # The image ID is the last non-empty path segment; rpartition finds it without a segment list.
+        potential_image_id = parsed_target_url.path.rstrip('/').rpartition('/')[2]
+        if potential_image_id:
+            smartframe_target_image_id = potential_image_id
+            smartframe_embed_selector = f'smartframe-embed[image-id="{potential_image_id}"]'
         if smartframe_target_image_id is None:
             smartframe_embed_selector = 'smartframe-embed:not([thumbnail-mode])'
     
     try:
-        async with async_playwright() as p:
-            # CRITICAL: Large viewport (9999x9999) is required for SmartFrame to render
-            # the canvas at full resolution. The SmartFrame embed renders its canvas
-            # based on the actual viewport/display size, not just CSS dimensions.
-            browser_context = await p.chromium.launch_persistent_context(
-                user_data_dir=str(user_data_dir),
-                headless=False,
-                args=[
-                    f'--disable-extensions-except={extension_dir.absolute()}',
-                    f'--load-extension={extension_dir.absolute()}',
-                    "--start-maximized"
-                ],
-                viewport={"width": 9999, "height": 9999},
-                ignore_https_errors=True
+        async with browser_pool.page() as page:
+            # Init scripts cannot be removed from a reused page and run in no guaranteed order,
+            # so each job's selector script carries a sequence number and only the newest applies.
+            job_sequence = time.monotonic_ns()
+            init_selector_script = (
+                f"if (!(window.__SMARTFRAME_JOB_SEQUENCE > {job_sequence})) {{"
+                f"window.__SMARTFRAME_JOB_SEQUENCE = {job_sequence};"
+                f"{selector_assignments_js(smartframe_embed_selector, smartframe_target_image_id, canvas_format)}"
+                f"}}"
             )
+            # Page-level init scripts keep the target selector scoped to this URL's tab.
+            await page.add_init_script(init_selector_script)
             
-            try:
-                init_selector_script = (
-                    f"window.__SMARTFRAME_EMBED_SELECTOR = {json.dumps(smartframe_embed_selector)};"
-                    f"window.__SMARTFRAME_TARGET_IMAGE_ID = {json.dumps(smartframe_target_image_id)};"
-                )
-                await browser_context.add_init_script(init_selector_script)
-                await browser_context.add_init_script(INJECTED_JAVASCRIPT_FOR_EXTENSION)
-                logger.info("INJECTED_JAVASCRIPT_FOR_EXTENSION injected as an init script.")
-
-                page = await browser_context.new_page()
-                
-                page.on("console", lambda msg: logger.info(f"Browser Console [{msg.type.upper()}]: {msg.text}"))
-                
-                logger.info(f"Navigating to URL: {target_url}")
-                await page.goto(target_url, wait_until="domcontentloaded", timeout=60000)
-                logger.info(f"Page loaded: {target_url} (DOM content loaded)")
-                
-                # Extract SmartFrame metadata from page
-                smartframe_metadata = await extract_smartframe_metadata(page, target_url)
+            logger.info(f"Navigating to URL: {target_url}")
+            await page.goto(target_url, wait_until="domcontentloaded", timeout=60000)
+            logger.info(f"Page loaded: {target_url} (DOM content loaded)")
+            
+            # Extract SmartFrame metadata from page
+            smartframe_metadata = await extract_smartframe_metadata(page, target_url)
 
-                response_selector = '#extension-response-data'
-                logger.info(f"Waiting for extension response element: {response_selector}")
-                
-                await page.wait_for_selector(
-                    f'{response_selector}[data-url], {response_selector}[data-error]', 
-                    state='attached', 
-                    timeout=120000
-                )
-                logger.info("Extension response element found.")
-
-                image_data_url = await page.locator(response_selector).get_attribute('data-url')
-                error_from_extension = await page.locator(response_selector).get_attribute('data-error')
+            response_selector = '#extension-response-data'
+            logger.info(f"Waiting for extension response element: {response_selector}")
+            
+            await page.wait_for_selector(
+                f'{response_selector}[data-blob-url], {response_selector}[data-error]', 
+                state='attached', 
+                timeout=120000
+            )
+            logger.info("Extension response element found.")
+
+            image_blob_url, error_from_extension = await page.locator(response_selector).evaluate(
+                "(element) => [element.getAttribute('data-blob-url'), element.getAttribute('data-error')]"
+            )
+            
+            image_id = None
+            try:
+                candidate_selectors = [
+                    smartframe_embed_selector,
+                    'smartframe-embed:not([thumbnail-mode])',
+                    'smartframe-embed'
+                ]
+                # Resolve the element and read its image-id in one evaluate rather than
+                # a count() and get_attribute() round-trip per candidate selector.
+                smartframe_element = await page.evaluate("""(selectors) => {
+                    for (const selector of selectors) {
+                        if (!selector) {
+                            continue;
+                        }
+                        const element = document.querySelector(selector);
+                        if (element) {
+                            return { selector: selector, imageId: element.getAttribute('image-id') };
+                        }
+                    }
+                    return null;
+                }""", candidate_selectors)
                 
-                image_id = None
-                try:
-                    candidate_selectors = [
-                        smartframe_embed_selector,
-                        'smartframe-embed:not([thumbnail-mode])',
-                        'smartframe-embed'
-                    ]
-                    smartframe_element = None
-                    for selector in candidate_selectors:
-                        if not selector:
-                            continue
-                        locator = page.locator(selector)
-                        if await locator.count() > 0:
-                            smartframe_element = locator.nth(0)
-                            logger.info(f"Selected smartframe element using selector '{selector}'.")
-                            break
-                    
-                    if smartframe_element:
-                        image_id_attr = await smartframe_element.get_attribute('image-id')
-                        if image_id_attr:
-                            image_id = image_id_attr.split('_').pop().replace(" ", "-")
-                            logger.info(f"Extracted image ID from smartframe-embed: {image_id}")
-                            page_result["Image ID"] = image_id
-                except Exception as e:
-                    logger.warning(f"Could not get image-id from smartframe-embed: {e}")
+                if smartframe_element:
+                    logger.info(f"Selected smartframe element using selector '{smartframe_element['selector']}'.")
+                    image_id_attr = smartframe_element["imageId"]
+                    if image_id_attr:
+                        image_id = image_id_attr.split('_').pop().replace(" ", "-")
+                        logger.info(f"Extracted image ID from smartframe-embed: {image_id}")
+                        page_result["Image ID"] = image_id
+            except Exception as e:
+                logger.warning(f"Could not get image-id from smartframe-embed: {e}")
+            
+            if error_from_extension:
+                error_msg = f"Extension reported error: {error_from_extension}"
+                logger.error(f"Error: {error_msg}")
+                page_result["Error Message"] = error_msg
+            elif image_blob_url and image_blob_url.startswith("blob:"):
+                file_extension = ".png"
+
+                final_filename = sanitize_filename(image_id if image_id else parsed_target_url.path.rsplit('/', 1)[-1]) + file_extension
+                output_path = output_dir_path / final_filename
+
+                image_data = await download_canvas_blob(page, image_blob_url)
+                logger.info(f"Successfully downloaded canvas image data ({len(image_data)} bytes).")
                 
-                if error_from_extension:
-                    error_msg = f"Extension reported error: {error_from_extension}"
-                    logger.error(f"Error: {error_msg}")
-                    page_result["Error Message"] = error_msg
-                elif image_data_url and image_data_url.startswith("data:image/png;base64,"):
-                    _, base64_data = image_data_url.split(",", 1)
-                    file_extension = ".png"
-
-                    final_filename = sanitize_filename(image_id if image_id else urlparse(target_url).path.split('/')[-1]) + file_extension
-                    output_path = output_dir_path / final_filename
-
-                    with open(output_path, "wb") as f:
-                        f.write(base64.b64decode(base64_data))
-
-                    logger.info(f"Successfully downloaded raw PNG: {output_path}")
-                    
-                    output_jpg_path = output_path.with_suffix(".jpg")
-                    if convert_png_to_jpg(output_path, output_jpg_path):
-                        logger.info(f"Converted PNG to JPG: {output_jpg_path}")
-                    else:
-                        logger.warning("Failed to convert PNG to JPG. Keeping PNG.")
-                        output_jpg_path = output_path
-
-                    # Handle thumbnail extraction and metadata transfer
-                    # Skip thumbnail for smartframe.com as these pages don't have thumbnails
-                    if is_smartframe_url:
-                        logger.info("Skipping thumbnail extraction for smartframe.com (no thumbnails available).")
-                    else:
-                        if not thumbnail_url:
-                            thumbnail_url = await get_thumbnail_url_from_page(page, page.url)
-                        
-                        if thumbnail_url:
-                            temp_thumbnail_path = temp_root_dir / "thumbnail.jpg"
-                            if download_thumbnail(thumbnail_url, temp_thumbnail_path):
-                                if not transfer_metadata_with_exiftool(temp_thumbnail_path, output_jpg_path):
-                                    logger.warning("Metadata transfer failed. Image saved without original metadata.")
-                            else:
-                                logger.warning("Thumbnail download failed. Skipping metadata transfer.")
-                        else:
-                            logger.info("No thumbnail URL available. Skipping metadata transfer.")
-
-                    logger.info(f"High-resolution image saved to: {output_jpg_path.resolve()}")
-                    
-                    # Save metadata to TXT file and write to image EXIF/IPTC fields if any metadata was extracted
-                    if smartframe_metadata and any(smartframe_metadata.values()):
-                        save_metadata_to_file(smartframe_metadata, output_jpg_path)
-                        write_metadata_to_image(smartframe_metadata, output_jpg_path)
-                    
-                    page_result.update({
-                        "Status": "Success",
-                        "Output Filename": output_jpg_path.name,
-                        "Error Message": "N/A"
-                    })
-                else:
-                    error_msg = "No valid image data URL received from extension."
-                    logger.error(f"Error: {error_msg}")
-                    page_result["Error Message"] = error_msg
-            finally:
-                # Close browser_context before exiting the async_playwright context
-                if browser_context:
-                    await browser_context.close()
+                # Only the thumbnail lookup needs the page; the download and transfer happen later.
+                if not is_smartframe_url and not thumbnail_url:
+                    thumbnail_url = await get_thumbnail_url_from_page(page, page.url)
+
+                return page_result, {
+                    "image_data": image_data,
+                    "output_path": output_path,
+                    "is_smartframe_url": is_smartframe_url,
+                    "thumbnail_url": thumbnail_url,
+                    "metadata": smartframe_metadata
+                }
+            else:
+                error_msg = "No valid canvas blob URL received from extension."
+                logger.error(f"Error: {error_msg}")
+                page_result["Error Message"] = error_msg
 
     except Exception as e:
         error_msg = f"An unrecoverable error occurred during the main execution for URL {target_url}: {e}"
         logger.critical(error_msg, exc_info=True)
         page_result["Error Message"] = error_msg
     
+    return page_result, None
+
+async def finish_capture(
+    page_result: Dict[str, Any],
+    capture: Dict[str, Any],
+    temp_root_dir: Path,
+    http_session: Optional[requests.Session] = None,
+    cpu_pool: Optional[concurrent.futures.Executor] = None,
+    exiftool: Optional[ExifToolDaemon] = None
+) -> Dict[str, Any]:
+    """
+    Encoding stage: saves the captured image as JPG (converting PNG captures first), copies
+    thumbnail metadata and writes the SmartFrame metadata. Conversion and metadata transfer run
+    on cpu_pool (the default thread pool when None) to keep the event loop free.
+    """
+    image_data = capture["image_data"]
+    output_path = capture["output_path"]
+    thumbnail_url = capture["thumbnail_url"]
+    smartframe_metadata = capture["metadata"]
+    try:
+        output_jpg_path = output_path.with_suffix(".jpg")
+        loop = asyncio.get_running_loop()
+        if image_data.startswith(JPEG_MAGIC):
+            # The browser already encoded the canvas as JPEG, so there is nothing to convert.
+            await asyncio.to_thread(output_jpg_path.write_bytes, image_data)
+            logger.info(f"Saved browser-encoded JPG: {output_jpg_path}")
+        elif await loop.run_in_executor(cpu_pool, convert_png_to_jpg, image_data, output_jpg_path):
+            logger.info(f"Converted PNG to JPG: {output_jpg_path}")
+        else:
+            logger.warning("Failed to convert PNG to JPG. Keeping PNG.")
+            await asyncio.to_thread(output_path.write_bytes, image_data)
+            output_jpg_path = output_path
+
+        # Handle thumbnail extraction and metadata transfer
+        # Skip thumbnail for smartframe.com as these pages don't have thumbnails
+        if capture["is_smartframe_url"]:
+            logger.info("Skipping thumbnail extraction for smartframe.com (no thumbnails available).")
+        elif thumbnail_url:
+            temp_thumbnail_path = temp_root_dir / "thumbnail.jpg"
+            if await asyncio.to_thread(download_thumbnail, thumbnail_url, temp_thumbnail_path, http_session):
+                if not await loop.run_in_executor(cpu_pool, transfer_metadata_with_exiftool, temp_thumbnail_path, output_jpg_path):
+                    logger.warning("Metadata transfer failed. Image saved without original metadata.")
+            else:
+                logger.warning("Thumbnail download failed. Skipping metadata transfer.")
+        else:
+            logger.info("No thumbnail URL available. Skipping metadata transfer.")
+
+        logger.info(f"High-resolution image saved to: {output_jpg_path.resolve()}")
+        
+        # Save metadata to TXT file and write to image EXIF/IPTC fields if any metadata was extracted.
+        # Empty fields are dropped once here, so both writers only see values they will use.
+        present_metadata = {key: value for key, value in (smartframe_metadata or {}).items() if value}
+        if present_metadata:
+            await asyncio.to_thread(save_metadata_to_file, present_metadata, output_jpg_path)
+            await asyncio.to_thread(write_metadata_to_image, present_metadata, output_jpg_path, exiftool)
+        
+        page_result.update({
+            "Status": "Success",
+            "Output Filename": output_jpg_path.name,
+            "Error Message": "N/A"
+        })
+    except Exception as e:
+        error_msg = f"An unrecoverable error occurred while saving the image for URL {page_result['Original URL']}: {e}"
+        logger.critical(error_msg, exc_info=True)
+        page_result["Error Message"] = error_msg
+    
     return page_result
 
 # --- Entry point for the script ---
-async def run_main_script():
-    OUTPUT_DIR_PATH = Path("downloaded_images")
+async def run_main_script(
+    urls_file: str = URLS_FILE,
+    output_dir: str = OUTPUT_DIR,
+    results_file: Optional[str] = None,
+    results_format: str = "ndjson",
+    max_workers: int = MAX_CONCURRENT_URLS,
+    max_batch_size: Optional[int] = None,
+    canvas_format: str = DEFAULT_CANVAS_FORMAT,
+    block_requests: bool = True,
+    resume: bool = True
+):
+    OUTPUT_DIR_PATH = Path(output_dir)
     os.makedirs(OUTPUT_DIR_PATH, exist_ok=True)
 
     EXTENSION_DIR = Path("./chrome_extension_bypass")
     USER_DATA_DIR = Path("./playwright_user_data")
     TEMP_ROOT_DIR = Path(tempfile.mkdtemp(prefix=TEMP_DIR_PREFIX))
     FAILED_DOWNLOADS_PATH = Path(FAILED_DOWNLOADS_FILE)
+    RESULTS_PATH = Path(results_file or RESULTS_FILE_BASENAME + RESULTS_FILE_EXTENSIONS[results_format])
     
     logger.info(f"Created temporary directory: {TEMP_ROOT_DIR.absolute()}")
+    log_imaging_backend()
 
-    all_results: List[Dict[str, Any]] = []
+    # Filled in as each URL completes, so an interrupted run can still report what finished.
+    indexed_results: List[Optional[Dict[str, Any]]] = []
     failed_report_written = False
+    # One HTTP session for the whole run so thumbnail downloads reuse connections.
+    http_session = requests.Session()
 
     try:
         if USER_DATA_DIR.exists():
@@ -1358,54 +1989,162 @@ async def run_main_script():
         setup_extension_files(EXTENSION_DIR)
 
         urls = []
-        URLS_FILE = "urls.txt"
         try:
-            with open(URLS_FILE, 'r') as f:
-                urls = [line.strip() for line in f if line.strip()]
+            # One read and one split; each line is stripped exactly once.
+            urls = [url for url in map(str.strip, Path(urls_file).read_text().splitlines()) if url]
             if not urls:
-                logger.warning(f"No URLs found in {URLS_FILE}. Using hardcoded example URL.")
+                logger.warning(f"No URLs found in {urls_file}. Using hardcoded example URL.")
                 urls = ["https://archive.newsimages.co.uk/id/00333991"]
         except FileNotFoundError:
-            logger.warning(f"Error: {URLS_FILE} not found. Using hardcoded example URL.")
+            logger.warning(f"Error: {urls_file} not found. Using hardcoded example URL.")
             urls = ["https://archive.newsimages.co.uk/id/00333991"]
         except Exception as e:
-            logger.error(f"Error reading {URLS_FILE}: {e}. Using hardcoded example URL.", exc_info=True)
+            logger.error(f"Error reading {urls_file}: {e}. Using hardcoded example URL.", exc_info=True)
             urls = ["https://archive.newsimages.co.uk/id/00333991"]
 
+        # Repeated URLs would redo a full page load and overwrite the same output file. The first
+        # spelling of each page is kept, in input order.
+        unique_urls: Dict[str, str] = {}
         for url in urls:
-            result = await process_url(
-                target_url=url,
-                output_dir_path=OUTPUT_DIR_PATH,
-                extension_dir=EXTENSION_DIR,
-                user_data_dir=USER_DATA_DIR,
-                temp_root_dir=TEMP_ROOT_DIR,
-                thumbnail_url=None
+            unique_urls.setdefault(canonicalize_url(url), url)
+        if len(unique_urls) != len(urls):
+            logger.info(f"Removed {len(urls) - len(unique_urls)} duplicate URL(s): {len(urls)} listed, {len(unique_urls)} unique.")
+        url_keys = list(unique_urls)
+        urls = list(unique_urls.values())
+
+        # URLs that already succeeded in an earlier run are carried over instead of reloaded.
+        # The previous results are read now, before this run's results file replaces them.
+        reusable_results = load_reusable_results(RESULTS_PATH, results_format, OUTPUT_DIR_PATH) if resume else {}
+        pending = [(index, url) for index, (key, url) in enumerate(zip(url_keys, urls)) if key not in reusable_results]
+        if len(pending) != len(urls):
+            logger.info(f"Reusing {len(urls) - len(pending)} successful result(s) from {RESULTS_PATH}; "
+                        f"pass --no-resume to process those URLs again.")
+
+        worker_count = max(1, min(max_workers, len(pending)))
+        queue_size = max_batch_size or worker_count * URL_QUEUE_SIZE_PER_WORKER
+        # Keep one pooled keep-alive connection per worker so concurrent thumbnail downloads are not discarded,
+        # and retry transient failures with backoff on the same pooled connections.
+        pooled_adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=worker_count,
+            max_retries=Retry(
+                total=THUMBNAIL_MAX_RETRIES,
+                backoff_factor=THUMBNAIL_RETRY_BACKOFF_SECONDS,
+                status_forcelist=(429, 500, 502, 503, 504)
             )
-            all_results.append(result)
-
-        print("\n--- SmartFrame Image Download Summary ---")
-        headers = ["Original URL", "Image ID", "Status", "Output Filename", "Error Message"]
-        table_data = []
-        for res in all_results:
-            table_data.append([
-                res.get("Original URL", "N/A"),
-                res.get("Image ID", "N/A"),
-                res.get("Status", "N/A"),
-                res.get("Output Filename", "N/A"),
-                res.get("Error Message", "N/A")
-            ])
-        print(tabulate(table_data, headers=headers, tablefmt="grid"))
-        print(f"\nDownloaded images saved to: {os.path.abspath(OUTPUT_DIR_PATH)}")
+        )
+        http_session.headers["User-Agent"] = HTTP_USER_AGENT
+        http_session.mount("https://", pooled_adapter)
+        http_session.mount("http://", pooled_adapter)
+        # Encoding is CPU-bound, so there is at most one encoder per core.
+        encoder_count = min(worker_count, os.cpu_count() or 1)
+        url_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        # Captured canvases waiting to be encoded; bounded so large image buffers cannot pile up.
+        capture_queue: asyncio.Queue = asyncio.Queue(maxsize=encoder_count)
+        indexed_results = [None] * len(urls)
+        completed_count = 0
+
+        def record_result(index: int, url: str, result: Dict[str, Any]):
+            nonlocal completed_count
+            indexed_results[index] = result
+            # Persist each record as soon as it completes so an interrupted run keeps its progress.
+            write_result(result)
+            completed_count += 1
+            logger.info(f"Processed {completed_count}/{len(urls)}: {url} ({result['Status']})")
+
+        async def produce_urls():
+            for item in pending:
+                await url_queue.put(item)
+            for _ in range(worker_count):
+                await url_queue.put(None)
+
+        async def url_worker(worker_id: int):
+            # Browser stage: the page is released once the canvas is captured, so this worker can
+            # navigate to the next URL while an encoder is still busy with the previous image.
+            while (item := await url_queue.get()) is not None:
+                index, url = item
+                result, capture = await capture_page(url, OUTPUT_DIR_PATH, browser_pool, canvas_format=canvas_format)
+                if capture is None:
+                    record_result(index, url, result)
+                else:
+                    await capture_queue.put((index, url, result, capture))
+
+        async def encode_worker(worker_id: int):
+            # Each encoder owns a scratch directory for thumbnails, reused for every image it handles.
+            worker_temp_dir = TEMP_ROOT_DIR / f"encoder_{worker_id}"
+            worker_temp_dir.mkdir(parents=True, exist_ok=True)
+            while (item := await capture_queue.get()) is not None:
+                index, url, result, capture = item
+                result = await finish_capture(result, capture, worker_temp_dir, http_session, cpu_pool, exiftool)
+                record_result(index, url, result)
+
+        async def run_browser_stage():
+            await asyncio.gather(produce_urls(), *(url_worker(worker_id) for worker_id in range(1, worker_count + 1)))
+            for _ in range(encoder_count):
+                await capture_queue.put(None)
+
+        # JSON arrays cannot be appended to, so JSON output streams NDJSON to a partial file first.
+        stream_path = RESULTS_PATH.with_name(RESULTS_PATH.name + ".partial") if results_format == "json" else RESULTS_PATH
+        results_stream, write_result = open_results_file(stream_path, results_format)
+        # Pillow decode/encode of full-size canvases is CPU-bound, so it runs in worker processes
+        # created once per run, one per encoder. Workers are spawned rather than forked: by the time
+        # the pool starts them this process already runs the log listener, to_thread workers and the
+        # Playwright and ExifTool pipes, and forking a multithreaded process can deadlock.
+        mp_context = multiprocessing.get_context("spawn")
+        with results_stream, forward_worker_logs(mp_context) as worker_log_queue:
+            cpu_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=encoder_count,
+                mp_context=mp_context,
+                initializer=init_cpu_worker,
+                initargs=(worker_log_queue,)
+            )
+            with cpu_pool, ExifToolDaemon() as exiftool:
+                for index, (key, url) in enumerate(zip(url_keys, urls)):
+                    if key in reusable_results:
+                        record_result(index, url, reusable_results[key])
+                if not pending:
+                    logger.info("Every URL already has a successful result; not starting the browser.")
+                else:
+                    async with BrowserPool(
+                        USER_DATA_DIR,
+                        EXTENSION_DIR,
+                        max_pages=worker_count,
+                        page_init_scripts=(INJECTED_JAVASCRIPT_FOR_EXTENSION,),
+                        block_requests=block_requests
+                    ) as browser_pool:
+                        logger.info(f"Processing {len(pending)} URL(s) with {worker_count} browser worker(s), {encoder_count} encoder(s), "
+                                    f"queue size {queue_size}, up to {browser_pool.max_pages} open page(s).")
+                        await asyncio.gather(run_browser_stage(), *(encode_worker(worker_id) for worker_id in range(1, encoder_count + 1)))
+        if results_format == "json":
+            ndjson_to_json_array(stream_path, RESULTS_PATH)
+            stream_path.unlink()
+        logger.info(f"Per-URL results written to: {RESULTS_PATH.resolve()}")
+        all_results = [res for res in indexed_results if res is not None]
 
         failed_report_written = write_failed_download_report(all_results, FAILED_DOWNLOADS_PATH)
+
+        # Build the whole summary first and emit it with a single write.
+        table_data = [format_result_row(res) for res in all_results]
+        summary_lines = [
+            "",
+            "--- SmartFrame Image Download Summary ---",
+            tabulate(table_data, headers=RESULT_FIELDS, tablefmt="grid"),
+            "",
+            f"Downloaded images saved to: {os.path.abspath(OUTPUT_DIR_PATH)}",
+            f"Per-URL results: {RESULTS_PATH.resolve()}"
+        ]
         if failed_report_written:
-            print(f"Failed download report: {FAILED_DOWNLOADS_PATH.resolve()}")
+            summary_lines.append(f"Failed download report: {FAILED_DOWNLOADS_PATH.resolve()}")
+        flush_log_queue()
+        sys.stdout.write("\n".join(summary_lines) + "\n")
+        sys.stdout.flush()
     except Exception as exc:
         logger.critical(f"Unrecoverable error in main execution: {exc}", exc_info=True)
         if not failed_report_written:
-            failed_report_written = write_failed_download_report(all_results, FAILED_DOWNLOADS_PATH)
+            failed_report_written = write_failed_download_report(
+                [res for res in indexed_results if res is not None], FAILED_DOWNLOADS_PATH)
         raise
     finally:
+        http_session.close()
         cleanup_temp_dirs(USER_DATA_DIR, EXTENSION_DIR)
         
         if TEMP_ROOT_DIR.exists():
@@ -1413,8 +2152,58 @@ async def run_main_script():
             logger.info(f"Cleaned up temporary directory: {TEMP_ROOT_DIR.absolute()}")
 
         if not failed_report_written and not FAILED_DOWNLOADS_PATH.exists():
-            write_failed_download_report(all_results, FAILED_DOWNLOADS_PATH)
+            write_failed_download_report([res for res in indexed_results if res is not None], FAILED_DOWNLOADS_PATH)
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parses command-line options so batch runs need no interactive input."""
+    parser = argparse.ArgumentParser(
+        description="Download high-resolution SmartFrame images for every URL in a list."
+    )
+    parser.add_argument("urls_file", nargs="?", default=URLS_FILE,
+                        help=f"Text file with one URL per line (default: {URLS_FILE})")
+    parser.add_argument("--urls-file", dest="urls_file_option", metavar="PATH",
+                        help="Alternative to the positional URLs file argument")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR,
+                        help=f"Directory for downloaded images (default: {OUTPUT_DIR})")
+    parser.add_argument("--results-file", default=None,
+                        help=f"Per-URL results file, written as URLs complete (default: {RESULTS_FILE_BASENAME} + format extension)")
+    parser.add_argument("--format", dest="results_format", choices=sorted(RESULTS_FILE_EXTENSIONS), default="ndjson",
+                        help="Format of the per-URL results file (default: ndjson)")
+    parser.add_argument("--workers", type=int, default=MAX_CONCURRENT_URLS,
+                        help=f"Number of URLs processed concurrently (default: {MAX_CONCURRENT_URLS})")
+    parser.add_argument("--max-batch", type=int, default=None,
+                        help="Maximum URLs queued ahead of the workers (default: two per worker)")
+    parser.add_argument("--canvas-format", choices=CANVAS_FORMATS, default=DEFAULT_CANVAS_FORMAT,
+                        help="How the browser encodes the canvas: jpg skips the PNG round-trip, "
+                             f"png is lossless and keeps transparency (default: {DEFAULT_CANVAS_FORMAT})")
+    parser.add_argument("--no-resume", dest="resume", action="store_false",
+                        help="Process every URL again instead of reusing successful results from the previous run")
+    parser.add_argument("--no-request-blocking", dest="block_requests", action="store_false",
+                        help="Let analytics and ad hosts resolve instead of blocking them")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.max_batch is not None and args.max_batch < 1:
+        parser.error("--max-batch must be at least 1")
+    return args
+
+def run_event_loop(coro):
+    """Runs the coroutine on uvloop when it is installed, otherwise on the default asyncio loop."""
+    if uvloop is not None and hasattr(asyncio, "Runner"):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    return asyncio.run(coro)
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(run_main_script())
+    cli_args = parse_args()
+    run_event_loop(run_main_script(
+        urls_file=cli_args.urls_file_option or cli_args.urls_file,
+        output_dir=cli_args.output_dir,
+        results_file=cli_args.results_file,
+        results_format=cli_args.results_format,
+        max_workers=cli_args.workers,
+        max_batch_size=cli_args.max_batch,
+        canvas_format=cli_args.canvas_format,
+        block_requests=cli_args.block_requests,
+        resume=cli_args.resume
+    ))
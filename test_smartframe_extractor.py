@@ -0,0 +1,57 @@
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+
+from dateutil import parser as date_parser
+
+import smartframe_extractor as extractor
+
+
+def empty_metadata():
+    return dict.fromkeys(extractor.METADATA_FIELDS)
+
+
+class FallbackMarkerTests(unittest.TestCase):
+    def test_image_id_and_size_on_one_line(self):
+        metadata = empty_metadata()
+        extractor.apply_fallback_markers(metadata, "Photo details SmartFrame image ID: 55 Image size: 3x3")
+        self.assertEqual(metadata["image_id"], "55")
+        self.assertEqual(metadata["image_size"], "3x3")
+
+    def test_image_size_keeps_spaces_up_to_end_of_line(self):
+        metadata = empty_metadata()
+        extractor.apply_fallback_markers(metadata, "Image size: 3000 x 2000 px\nWhen: 15.11.07")
+        self.assertEqual(metadata["image_size"], "3000 x 2000 px")
+        self.assertEqual(metadata["date"], "15.11.07")
+
+
+class CanonicalizeUrlTests(unittest.TestCase):
+    def test_lowercases_host_but_not_user_info_or_path(self):
+        self.assertEqual(
+            extractor.canonicalize_url("HTTPS://User:Pw@Host.COM/Image/42/#top"),
+            "https://User:Pw@host.com/Image/42",
+        )
+
+
+class ParseDateTests(unittest.TestCase):
+    def test_dotted_two_digit_years_match_dateutil(self):
+        for year in ("07", "27", "49", "50", "75", "76", "99"):
+            with self.subTest(year=year):
+                dotted = extractor.parse_date(f"15.11.{year}")
+                self.assertEqual(dotted, datetime.datetime(dotted.year, 11, 15))
+                self.assertEqual(dotted.year, date_parser.parse(f"15 Nov {year}").year)
+
+
+class ReusableResultsTests(unittest.TestCase):
+    def test_json_that_is_not_a_list_of_records_is_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            results_path = Path(tmp) / "results.json"
+            for content in ('"not a list"', '["not a record"]', '{"Status": "Success"}'):
+                results_path.write_text(content, encoding="utf-8")
+                with self.assertLogs(extractor.logger, "WARNING"):
+                    self.assertEqual(extractor.load_reusable_results(results_path, "json", Path(tmp)), {})
+
+
+if __name__ == "__main__":
+    unittest.main()